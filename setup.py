@@ -3,7 +3,7 @@ from distutils.core import setup
 setup(
 	name = 'Selenium2LibraryExtension',
 	package_dir  = {'' : 'src'},
-	packages = ['Selenium2LibraryExtension', 'Selenium2LibraryExtension.keywords', 'Selenium2LibraryExtension.patches'],
+	packages = ['Selenium2LibraryExtension', 'Selenium2LibraryExtension.keywords', 'Selenium2LibraryExtension.patches', 'Selenium2LibraryExtension.utils'],
 	version = '1.1.0',
 	description = 'This library was created as an expansion to Selenium2Library. It was initially created as a solution to specific test cases that required overhead (such as calling inline javascripts or using many steps for one action). It also features bugfixes.',
 	author = 'Askida',
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import weakref
+import robot
 from Selenium2Library import Selenium2Library
 from Selenium2Library.utils import LibraryListener
 from Selenium2LibraryExtension.patches import _patches
 from Selenium2LibraryExtension.keywords import _keywords
+from Selenium2LibraryExtension.utils import (CommandTracer, ConnectionPool,
+                                              ElementCache, KeywordProfiler,
+                                              PollScheduler, PooledBrowserCache,
+                                              SessionPool, runtime)
 
 
 class Selenium2LibraryExtension(Selenium2Library, _patches, _keywords):
@@ -21,8 +27,85 @@ class Selenium2LibraryExtension(Selenium2Library, _patches, _keywords):
     | =locator= | =Description= | =Example of Usage= |
     | input | retrieves the currently active input element. the argument always is `current` | input=current |
     | meta_name | retrieves the meta element(s) with the specified name | meta_name=description |
-    | last_tag | retrieves the last element with the specified tag | last_tag=div |
-    | first_tag | retrieves the first element with the specified tag | first_tag=div |"""
+    | last_tag | retrieves the last element with the specified tag (or CSS selector) | last_tag=div |
+    | first_tag | retrieves the first element with the specified tag (or CSS selector) | first_tag=div |
+
+    These locators don't need jQuery to be loaded in the page.
+
+    = Wait Polling =
+
+    The `Wait Until ...` keywords don't poll at a fixed rate. The first polls are done every `poll_interval`, then the delay
+    between two polls grows by a factor of `poll_backoff` up to `poll_max_interval`, with a random `poll_jitter` so that
+    parallel waits don't poll in lockstep. The last poll always happens right at the end of the timeout. The schedule can be
+    given when importing the library and changed at any time with `Set Wait Poll Schedule`.
+
+    The focus, attribute, class and page content waits of this library are done inside the browser when their locators
+    use the `id`, `name`, `identifier`, `xpath`, `css` or `tag` strategies, one of the `New Locators` or no prefix: the page is observed and the
+    keyword returns as soon as the condition is met, in one or two calls to the browser. They fall back to polling from
+    Python for other locators, or for all of them when the library is imported with `in_browser_waits=${False}`.
+
+    = Stale Elements =
+
+    The keywords of this library which find an element and then act on it, or read it, find the element again when it
+    goes stale in between, e.g. because the page re-rendered it, and only redo the step that failed instead of failing or
+    waiting for the next poll of a `Wait Until ...` keyword. Each step is retried up to `stale_element_retries` times
+    before its error is raised. Every recovery is logged with the number of stale elements so far, which
+    `Get Stale Element Stats` returns.
+
+    = Session Pool =
+
+    When the library is imported with a `session_pool_size` greater than 0, `Close Browser` and `Close All Browsers` don't
+    quit the browsers opened by `Open Browser`: up to `session_pool_size` sessions are kept running for each set of `Open Browser`
+    arguments, and the next `Open Browser` with the same arguments leases an idle one instead of launching a browser. After
+    the first `Open Browser`, the pool launches the other sessions in the background so that they are ready when needed.
+
+    Before being leased again, a session is reset: its extra windows are closed, the cookies and the local and session
+    storage of its current page are cleared and a blank page is loaded. Data stored for other domains than the one of the last
+    page is kept. A session is quit after `session_max_uses` leases, when it doesn't respond anymore and when the tests end.
+
+    = Connection Pool =
+
+    When the library is imported with a `connection_pool_size` greater than 0, the commands of the browsers opened with
+    `Open Browser` or registered with `Register Webdriver` are sent over keep-alive HTTP connections, which are shared by all
+    of the browsers of the library instead of opening a connection per command. Up to `connection_pool_size` idle connections
+    are kept for each WebDriver server, and the ones idle for more than `connection_idle_timeout` seconds are closed.
+    `connection_timeout` is the socket timeout of the connections, it defaults to the one of Selenium. By default, the
+    commands are sent as Selenium does.
+
+    A command is sent again, once, only when the server had closed the idle connection before getting it. It is never sent
+    again after a timeout or when the connection fails once the command was sent, so that no command runs twice.
+    `Get Connection Pool Stats` tells how often the connections were reused.
+
+    = Element Cache =
+
+    When the library is imported with an `element_cache_size` greater than 0, the elements found by the keywords are kept,
+    for up to `element_cache_size` locators, so that a sequence of keywords on the same locator, such as
+    `Element Value Should Be` and `Element Width Should Be`, doesn't search the page each time. A cached element is only used
+    if the page didn't change since it was found: the page counts its own mutations, from the first lookup of the cache in it,
+    and checking the count of the current window or frame is one small call to the browser. The locator is resolved again when the page changed, when the element
+    is stale and in any other window or frame.
+
+    Only the locators using the `id`, `name`, `identifier`, `xpath`, `css` or `tag` strategies, the `meta_name`, `first_tag`
+    and `last_tag` strategies or no prefix are cached, except for the CSS selectors with pseudo-classes such as `:checked`, which
+    depend on more than the page content. The first lookup of a locator costs the extra call, so the cache is only worth it
+    when the same locators are used several times on pages that don't change constantly. `Get Element Cache Stats` tells how
+    often the cache was used.
+
+    = Command Trace =
+
+    When the library is imported with `command_trace` set to the path of a JSON file, every command sent to the browsers
+    is recorded with its latency and the size of its payload. When a keyword or a test ends, the number of commands it sent
+    and their p50, p95 and p99 latencies are logged. When the execution ends, the summaries by test, by keyword (with their
+    number of calls) and by command are written to the JSON file, relative to the output directory. `Get Command Count` tells
+    how many commands were sent during the current test.
+
+    = Keyword Profile =
+
+    When the library is imported with `keyword_profile` set to a path without extension, the time of every keyword is
+    measured: its wall time, and its self time (not spent in its child keywords) split into the time blocked on the commands
+    sent to the browsers, the time sleeping between the polls of the `Wait Until ...` keywords, and the remaining Python
+    time. When the execution ends, the profile is written relative to the output directory as `.folded` collapsed stacks,
+    which can be turned into a flame graph with `flamegraph.pl`, and as `.json` and `.html` reports of the totals by keyword."""
 
     ROBOT_LIBRARY_DOC_FORMAT = 'ROBOT'
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
@@ -32,18 +115,70 @@ class Selenium2LibraryExtension(Selenium2Library, _patches, _keywords):
                  timeout=10.0,
                  implicit_wait=0.0,
                  run_on_failure='Capture Page Screenshot',
-                 screenshot_root_directory=None):
+                 screenshot_root_directory=None,
+                 poll_interval=0.05,
+                 poll_max_interval=1.0,
+                 poll_backoff=1.5,
+                 poll_jitter=0.1,
+                 in_browser_waits=True,
+                 session_pool_size=0,
+                 session_max_uses=50,
+                 connection_pool_size=0,
+                 connection_timeout=None,
+                 connection_idle_timeout=30.0,
+                 command_trace=None,
+                 keyword_profile=None,
+                 element_cache_size=0,
+                 stale_element_retries=2):
         """Selenium2LibraryExtension can be imported with the same arguments as Selenium2Library. See the
-        [http://robotframework.org/Selenium2Library/doc/Selenium2Library.html#Importing|importing] documentation for more details."""
+        [http://robotframework.org/Selenium2Library/doc/Selenium2Library.html#Importing|importing] documentation for more details.
+
+        The `poll_*` and `in_browser_waits` arguments define how the `Wait Until ...` keywords wait, see `Wait Polling`.
+        The `session_*` arguments define how browser sessions are reused, see `Session Pool`, and the `connection_*` ones how
+        the commands are sent to the browsers, see `Connection Pool`. `command_trace` enables the `Command Trace`,
+        `keyword_profile` the `Keyword Profile` and `element_cache_size` the `Element Cache`. `stale_element_retries` is
+        the number of times a step is retried when its element goes stale, see `Stale Elements`."""
 
         for base in Selenium2Library.__bases__:
             base.__init__(self)
 
         self.screenshot_root_directory = screenshot_root_directory
+        # implicit wait of each browser, when it isn't the one of the library
+        self._implicit_waits = weakref.WeakKeyDictionary()
         self.set_selenium_timeout(timeout)
         self.set_selenium_implicit_wait(implicit_wait)
         self.register_keyword_to_run_on_failure(run_on_failure)
+        self._poll_scheduler = PollScheduler(poll_interval, poll_max_interval,
+                                             poll_backoff, poll_jitter)
+        self._in_browser_waits = in_browser_waits
+        self._stale_element_retries = int(stale_element_retries)
+        if self._stale_element_retries < 0:
+            raise ValueError("Stale element retries should be positive, got "
+                             "'%s'" % stale_element_retries)
+        self._stale_element_stats = dict.fromkeys(
+            ('stale', 'recovered', 'exhausted'), 0)
+        self._implicit_wait_suspensions = 0
+        self._key_macros = {}
+        self._session_pool = SessionPool(session_pool_size, session_max_uses)
+        self._connection_pool = ConnectionPool(connection_pool_size,
+                                               connection_timeout,
+                                               connection_idle_timeout)
+        self._command_tracer = CommandTracer(command_trace) \
+            if command_trace else None
+        self._keyword_profiler = KeywordProfiler(keyword_profile) \
+            if keyword_profile else None
+        self._element_cache = ElementCache(element_cache_size)
+        self._cache = PooledBrowserCache(
+            self._session_pool,
+            [installer for installer in (self._connection_pool,
+                                         self._command_tracer,
+                                         self._keyword_profiler) if installer])
         self.ROBOT_LIBRARY_LISTENER = LibraryListener()
+        if self._command_tracer or self._keyword_profiler:
+            self.ROBOT_LIBRARY_LISTENER = [
+                listener for listener in (self.ROBOT_LIBRARY_LISTENER,
+                                          self._command_tracer,
+                                          self._keyword_profiler) if listener]
 
         # register new locators
         self.add_location_strategy(
@@ -55,6 +190,66 @@ class Selenium2LibraryExtension(Selenium2Library, _patches, _keywords):
         self.add_location_strategy(
             'first_tag', self._locator_find_first_by_tag, persist=True)
 
+    def _make_browser(self,
+                      browser_name,
+                      desired_capabilities=None,
+                      profile_dir=None,
+                      remote=None):
+
+        def launch():
+            return Selenium2Library._make_browser(
+                self, browser_name, desired_capabilities, profile_dir, remote)
+
+        if not self._session_pool.size:
+            return launch()
+
+        key = SessionPool.key(browser_name.lower().replace(' ', ''),
+                              desired_capabilities, profile_dir, remote)
+        browser = self._session_pool.lease(key, launch)
+
+        # the settings may have changed since the session was created
+        browser.set_speed(self._speed_in_secs)
+        browser.set_script_timeout(self._timeout_in_secs)
+        browser.implicitly_wait(self._implicit_wait_in_secs)
+        self._implicit_waits.pop(browser, None)
+        return browser
+
+    def set_selenium_implicit_wait(self, seconds):
+
+        for browser in self._cache.get_open_browsers():
+            self._implicit_waits.pop(browser, None)
+        return Selenium2Library.set_selenium_implicit_wait(self, seconds)
+
+    set_selenium_implicit_wait.__doc__ = \
+        Selenium2Library.set_selenium_implicit_wait.__doc__
+
+    def set_browser_implicit_wait(self, seconds):
+
+        Selenium2Library.set_browser_implicit_wait(self, seconds)
+        self._implicit_waits[self._current_browser()] = \
+            robot.utils.timestr_to_secs(seconds)
+
+    set_browser_implicit_wait.__doc__ = \
+        Selenium2Library.set_browser_implicit_wait.__doc__
+
+    def _element_find(self, locator, first_only, required, tag=None):
+
+        if not self._element_cache.size or \
+                not self._element_cache.accepts(locator):
+            return Selenium2Library._element_find(self, locator, first_only,
+                                                  required, tag)
+
+        browser = self._current_browser()
+        elements = self._element_cache.find(
+            browser, (locator, tag),
+            lambda: self._element_finder.find(browser, locator, tag))
+        if required and not elements:
+            raise ValueError("Element locator '" + locator +
+                             "' did not match any elements.")
+        if first_only:
+            return elements[0] if elements else None
+        return elements
+
     # LOCATORS
 
     def _locator_find_active_element(self, browser, criteria, tag,
@@ -62,13 +257,13 @@ class Selenium2LibraryExtension(Selenium2Library, _patches, _keywords):
         return browser.switch_to.active_element
 
     def _locator_find_by_meta_name(self, browser, criteria, tag, constraints):
-        return browser.execute_script("return $('meta[name=%s]');" % criteria)
+        return runtime.call(browser, 'findByLocator', ['meta_name', criteria])
 
     def _locator_find_last_by_tag(self, browser, criteria, tag, constraints):
-        return browser.execute_script("return $('%s:last');" % criteria)
+        return runtime.call(browser, 'findByLocator', ['last_tag', criteria])
 
     def _locator_find_first_by_tag(self, browser, criteria, tag, constraints):
-        return browser.execute_script("return $('%s:first');" % criteria)
+        return runtime.call(browser, 'findByLocator', ['first_tag', criteria])
 
     def _add_new_function_as_class_attribute(self, new_function):
         '''
@@ -1,13 +1,30 @@
 # -*- coding: utf-8 -*-
 
+import socket
 import time
+import uuid
+import robot
+from contextlib import contextmanager
+
+try:
+    from urllib.error import URLError
+except ImportError:
+    from urllib2 import URLError
+
 from selenium.common.exceptions import (
     ElementNotVisibleException, NoSuchElementException,
-    StaleElementReferenceException, WebDriverException)
+    StaleElementReferenceException, TimeoutException, WebDriverException)
+from selenium.webdriver.remote.remote_connection import RemoteConnection
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
 from robot.libraries.BuiltIn import BuiltIn
 from robot.api import logger
+from Selenium2LibraryExtension.utils import (KeyMacro, PollScheduler, runtime,
+                                              to_browser_locator,
+                                              to_browser_locators)
+
+_UNDO = KeyMacro('CONTROL+z')
+_REDO = KeyMacro('CONTROL+y')
+_SELECT_ALL_AND_DELETE = KeyMacro('CONTROL+a', 'DELETE')
 
 
 class _keywords():
@@ -24,8 +41,9 @@ class _keywords():
         | timeout | maximum time to wait before the function throws an element not found error (default=None) | 5s |"""
 
         self._info("Waiting for focus on '%s'" % (locator))
-        self._wait_until_no_error(timeout, self._check_element_focus_exp, True,
-                                  locator, timeout)
+        self._wait_until_in_browser(timeout, 'focus', [locator], [True],
+                                    self._check_element_focus_exp, True,
+                                    locator, timeout)
 
     def wait_until_element_does_not_have_focus(self, locator, timeout=None):
         """Waits until the element identified by `locator` doesn't have focus.
@@ -36,8 +54,9 @@ class _keywords():
         | timeout | maximum time to wait before the function throws an element not found error (default=None) | 5s |"""
 
         self._info("Waiting until '%s' does not have focus" % (locator))
-        self._wait_until_no_error(timeout, self._check_element_focus_exp,
-                                  False, locator, timeout)
+        self._wait_until_in_browser(timeout, 'focus', [locator], [False],
+                                    self._check_element_focus_exp, False,
+                                    locator, timeout)
 
     def wait_until_element_attribute_is(self,
                                         locator,
@@ -56,9 +75,11 @@ class _keywords():
         | timeout | maximum time to wait before the function throws an element not found error (default=None) | 5s |"""
 
         self._info("Waiting for '%s' value to be '%s'" % (locator, expected))
-        self._wait_until_no_error(timeout, self._check_element_attribute_exp,
-                                  False, locator, expected, attribute, strip,
-                                  timeout)
+        self._wait_until_in_browser(
+            timeout, 'attribute', [locator],
+            [False, expected, attribute, bool(strip)],
+            self._check_element_attribute_exp, False, locator, expected,
+            attribute, strip, timeout)
 
     def wait_until_element_attribute_contains(self,
                                               locator,
@@ -76,9 +97,10 @@ class _keywords():
 
         self._info("Waiting for '%s' value to contain '%s'" %
                    (locator, expected))
-        self._wait_until_no_error(timeout, self._check_element_attribute_exp,
-                                  True, locator, expected, attribute, False,
-                                  timeout)
+        self._wait_until_in_browser(
+            timeout, 'attribute', [locator], [True, expected, attribute, False],
+            self._check_element_attribute_exp, True, locator, expected,
+            attribute, False, timeout)
 
     def set_element_focus(self, locator):
         """Sets focus on the element identified by `locator`. Should
@@ -91,11 +113,12 @@ class _keywords():
 
         self._info("Setting focus on element '%s'" % (locator))
 
-        element = self._element_find(locator, True, True)
-        element.send_keys(Keys.NULL)
+        self._with_element(locator,
+                           lambda element: element.send_keys(Keys.NULL))
 
-        self._wait_until_no_error(None, self._check_element_focus, True,
-                                  locator)
+        self._wait_until_in_browser(None, 'focus', [locator], [True],
+                                    self._check_element_focus_exp, True,
+                                    locator)
 
     def clear_input_field(self, locator, method=0):
         """Clears the text field identified by `locator`
@@ -108,42 +131,99 @@ class _keywords():
 
         0 = Uses the selenium method by doing element.clear \n
         1 = Sets focus on the field and presses CTRL + A, and then DELETE \n
-        2 = Repeatedly presses BACKSPACE until the field is empty
+        2 = Repeatedly presses BACKSPACE until the field is empty \n
+        3 = Selects and deletes the content of the field from inside the browser, or sets its value
+        and fires the `input` and `change` events when the browser can't delete it
 
-        This keyword, when using a method other than '2' does not validate it
+        This keyword, when using the method '0' or '1' does not validate it
         successfully cleared the field, you should handle this verification by yourself.
         When using the method '2', it presses delete until the field's value is empty.
+        The method '3' verifies the field is empty, in the same single call to the browser
+        whatever the length of the text.
 
         | *Argument* | *Description* | *Example* |
         | locator | Selenium 2 element locator | id=my_id |
         | method | the clearing method that should be used | no example provided |"""
 
-        element = self._element_find(locator, True, True)
+        if (int(method) == 3):
+
+            self._info("Clearing input on element '%s' from the browser" %
+                       (locator))
+            self._clear_field_in_browser(locator)
+            return
 
         if (int(method) == 0):
 
             self._info("Clearing input on element '%s'" % (locator))
-            element.clear()
+            self._with_element(locator, lambda element: element.clear())
 
         elif (int(method) == 1):
 
             self._info(
                 "Clearing input on element '%s' by pressing 'CTRL + A + DELETE'"
                 % (locator))
-            element.send_keys(Keys.CONTROL + 'a')
-            element.send_keys(Keys.DELETE)
+
+            def select_and_delete(element):
+                element.send_keys(Keys.CONTROL + 'a')
+                element.send_keys(Keys.DELETE)
+
+            self._with_element(locator, select_and_delete)
 
         elif (int(method) == 2):
 
             self._info(
                 "Clearing input on element '%s' by repeatedly pressing BACKSPACE"
                 % (locator))
-            while (len(element.get_attribute('value')) != 0):
 
-                element.send_keys(Keys.BACKSPACE)
+            def press_backspace(element):
+                while (len(element.get_attribute('value')) != 0):
+
+                    element.send_keys(Keys.BACKSPACE)
+
+            self._with_element(locator, press_backspace)
 
         else:
-            element.clear()
+            self._with_element(locator, lambda element: element.clear())
+
+    def input_text_in_bulk(self, locator, text, type_last=0):
+        """Replaces the value of the text field identified by `locator` with `text`, setting it from
+        inside the browser instead of typing it key by key, and returns how long it took in seconds.
+        This is meant for long texts, which take seconds to type.
+
+        The `input`, `keyup` and `change` events are fired after setting the value. The last `type_last`
+        characters of the text are then typed like with `Input Text`, for the pages that react to
+        actual key presses, such as autocompletion fields.
+
+        | *Argument* | *Description* | *Example* |
+        | locator | Selenium 2 element locator | id=my_id |
+        | text | the text to enter | ${json} |
+        | type_last | number of characters to type at the end of the text (default=0) | 3 |"""
+
+        type_last = min(int(type_last), len(text))
+        head, tail = text[:len(text) - type_last], text[len(text) - type_last:]
+        start = time.time()
+
+        result = self._with_target(
+            locator, lambda target: runtime.call(self._current_browser(),
+                                                 'bulkInput', target, head))
+        if result is None:
+            raise ValueError("Element locator '%s' did not match any elements."
+                             % locator)
+
+        element, editable = result
+        if not editable:
+            raise AssertionError("Element '%s' is read-only or disabled" %
+                                 locator)
+        if tail:
+            self._with_element(locator,
+                               lambda element: element.send_keys(tail),
+                               element)
+
+        elapsed = time.time() - start
+        self._info("Entered %d characters (%d typed) in element '%s' in %s" %
+                   (len(text), len(tail), locator,
+                    robot.utils.secs_to_timestr(elapsed)))
+        return elapsed
 
     def element_text_color_should_be(self, locator, expected):
         """Verifies the element identified by `locator` has the expected
@@ -209,19 +289,7 @@ class _keywords():
 
         self._info("Verifying element '%s' value is '%s'" %
                    (locator, expected))
-
-        element = self._element_find(locator, True, True)
-        value = element.get_attribute('value')
-
-        if (strip):
-            value = value.strip()
-
-        if str(value) == expected:
-            return
-
-        else:
-            raise AssertionError("Element '%s' value was not '%s', it was '%s'"
-                                 % (locator, expected, value))
+        self._check_element_value(locator, expected, strip)
 
     def element_value_should_not_be(self, locator, value, strip=False):
         """Verifies the element identified by `locator` is not the specified value.
@@ -234,8 +302,8 @@ class _keywords():
         self._info("Verifying element '%s' value is not '%s'" %
                    (locator, value))
 
-        element = self._element_find(locator, True, True)
-        elem_value = str(element.get_attribute('value'))
+        elem_value = str(self._with_element(
+            locator, lambda element: element.get_attribute('value')))
 
         if (strip):
             elem_value = elem_value.strip()
@@ -255,8 +323,8 @@ class _keywords():
         self._info("Verifying element '%s' value contains '%s'" %
                    (locator, expected))
 
-        element = self._element_find(locator, True, True)
-        value = str(element.get_attribute('value'))
+        value = str(self._with_element(
+            locator, lambda element: element.get_attribute('value')))
 
         if expected in value:
             return
@@ -276,8 +344,8 @@ class _keywords():
         self._info("Verifying element '%s' value does not contain '%s'" %
                    (locator, value))
 
-        element = self._element_find(locator, True, True)
-        elem_value = str(element.get_attribute('value'))
+        elem_value = str(self._with_element(
+            locator, lambda element: element.get_attribute('value')))
 
         if value in elem_value:
             raise AssertionError(
@@ -316,6 +384,88 @@ class _keywords():
             % (locator, prop, expected))
         self._check_element_css_value(locator, prop, expected)
 
+    def get_element_snapshot(self, locator, *styles):
+        """Returns the state of the element identified by `locator`, fetched from the browser
+        in a single call. Use it rather than several `Element ... Should Be` keywords when checking
+        many properties of the same element.
+
+        The returned dictionary contains:
+        | =Key= | =Description= |
+        | value | value of the element, as returned by `Get Value` |
+        | text | visible text of the element |
+        | classes | list of the classes of the element |
+        | styles | dictionary of the computed values of the css properties given as `styles`, colors are in RGBA format |
+        | rect | dictionary with the x, y, width and height of the element's bounding rectangle |
+        | size | dictionary with the width and height of the element, in pixels |
+        | focused | whether the element has focus |
+        | visible | whether the element is displayed |
+
+        | =Argument= | =Description= | =Example= |
+        | locator | Selenium 2 element locator | id=my_id |
+        | *styles | names of the css properties to fetch | color |
+
+        Example:
+        | ${snapshot}= | Get Element Snapshot | id=my_id | color | background-color |
+        | Should Be Equal | ${snapshot['styles']['color']} | rgba(0, 128, 0, 1) |
+        | Should Be True | ${snapshot['focused']} |"""
+
+        self._info("Getting snapshot of element '%s'" % locator)
+        return self._element_snapshots([locator], styles)[0]
+
+    def elements_should_match(self, *rows):
+        """Verifies many properties of many elements at once. The arguments are rows of
+        three cells: the locator of the element, the property to check and its expected value.
+
+        All the elements are fetched in a single call to the browser, and all the rows are
+        checked: when some of them fail, the error lists every mismatch.
+
+        | =Property= | =Verifies= | =Equivalent keyword= |
+        | value | the value of the element | `Element Value Should Be` |
+        | text | the visible text of the element | |
+        | class | the element has the expected class(es) | `Element Should Have Class` |
+        | width | the width of the element, in pixels | `Element Width Should Be` |
+        | height | the height of the element, in pixels | `Element Height Should Be` |
+        | focus | the element has focus (True) or not (False) | `Element Focus Should Be Set` |
+        | visible | the element is displayed (True) or not (False) | |
+        | css:<name> | the value of the css property <name> | `Element Css Attribute Should Be` |
+
+        Example:
+        | Elements Should Match | id=first_name | value | John |
+        | ... | id=first_name | css:border-color | rgb(0, 0, 0) |
+        | ... | id=last_name | value | Doe |
+        | ... | id=submit | class | enabled |"""
+
+        if not rows or len(rows) % 3:
+            raise ValueError("Elements Should Match expects rows of locator, "
+                             "property and expected value, got %d arguments"
+                             % len(rows))
+
+        rows = [rows[i:i + 3] for i in range(0, len(rows), 3)]
+        locators = []
+        styles = []
+        for locator, prop, expected in rows:
+            if locator not in locators:
+                locators.append(locator)
+            if prop.startswith('css:') and prop[4:] not in styles:
+                styles.append(prop[4:])
+
+        self._info("Verifying %d properties of %d elements" %
+                   (len(rows), len(locators)))
+        snapshots = dict(
+            zip(locators, self._element_snapshots(locators, styles, False)))
+
+        errors = []
+        for locator, prop, expected in rows:
+            try:
+                self._check_snapshot_property(locator, prop, expected,
+                                              snapshots[locator])
+            except AssertionError as e:
+                errors.append(str(e))
+
+        if errors:
+            raise AssertionError("%d of %d rows did not match:\n%s" %
+                                 (len(errors), len(rows), '\n'.join(errors)))
+
     def wait_until_page_contains_elements(self, timeout, *locators):
         """This is a copy of `Wait Until Page Contains Element` but it allows
         multiple arguments in order to wait for more than one element.
@@ -324,7 +474,8 @@ class _keywords():
         | timeout | maximum time to wait, if set to ${None} it will use Selenium's default timeout | 5s |
         | *locators | Selenium 2 element locator(s) | id=MyId |"""
 
-        self._wait_until_no_error(timeout, self._wait_for_elements, locators)
+        self._wait_until_in_browser(timeout, 'present', locators, [],
+                                    self._wait_for_elements, locators)
 
     def wait_until_page_contains_one_of_these_elements(self, timeout,
                                                        *locators):
@@ -334,8 +485,9 @@ class _keywords():
         | timeout | maximum time to wait, if set to ${None} it will use Selenium's default timeout | 5s |
         | *locators | Selenium 2 element locator(s) | id=MyId |"""
 
-        self._wait_until_no_error(timeout, self._wait_for_at_least_one_element,
-                                  locators)
+        self._wait_until_in_browser(timeout, 'any_present', locators, [],
+                                    self._wait_for_at_least_one_element,
+                                    locators)
 
     def wait_until_page_does_not_contain_these_elements(self, timeout,
                                                         *locators):
@@ -345,8 +497,9 @@ class _keywords():
         | timeout | maximum time to wait, if set to ${None} it will use Selenium's default timeout | 5s |
         | *locators | Selenium 2 element locator(s) | id=MyId |"""
 
-        self._wait_until_no_error(timeout, self._wait_for_elements_to_go_away,
-                                  locators)
+        self._wait_until_in_browser(timeout, 'absent', locators, [],
+                                    self._wait_for_elements_to_go_away,
+                                    locators)
 
     def tap_key(self, key, complementKey=None):
         """Presses the specified `key`. The `complementKey` defines the key to hold
@@ -357,26 +510,112 @@ class _keywords():
         | key | the key to press | ${VK_F4} |
         | complementKey | the key to hold while pressing the key passed in previous argument | ${VK_ALT} |"""
 
-        driver = self._current_browser()
-
         if (complementKey is not None):
-            ActionChains(driver).key_down(complementKey).send_keys(key).key_up(
-                complementKey).perform()
+            self._play_key_macro(KeyMacro((complementKey, key)))
 
         else:
-            ActionChains(driver).send_keys(key).perform()
+            self._play_key_macro(KeyMacro((key, )))
+
+    def define_key_macro(self, name, *steps):
+        """Defines the key macro `name`, which presses the keys of all the `steps` when played with
+        `Play Key Macro`. The macro is compiled once and played in a single request to the browser,
+        where pressing the same keys with separate keywords takes one request per keyword.
+
+        A step is either a text prefixed by `text:`, which is typed, or a chord of key names joined by `+`:
+        the keys are pressed in order and released in reverse order. Key names are the ones of Selenium's
+        `Keys` class, such as CONTROL (or CTRL), SHIFT, ALT, TAB, ENTER, DELETE or F1, or single characters.
+
+        | =Argument= | =Description= | =Example= |
+        | name | name of the macro | select all and type |
+        | *steps | chords and texts | CTRL+a | text:Hello World | SHIFT+TAB |"""
+
+        self._key_macros[name] = KeyMacro(*steps)
+
+    def play_key_macro(self, name):
+        """Plays the key macro `name` defined with `Define Key Macro` in the element that has focus.
+
+        | =Argument= | =Description= | =Example= |
+        | name | name of the macro | select all and type |"""
+
+        if name not in self._key_macros:
+            raise ValueError("Key macro '%s' is not defined" % name)
+        self._play_key_macro(self._key_macros[name])
 
     def wait_until_element_is_clickable(self, locator, timeout=None):
-        """Clicks the element specified by `locator` until the operation succeeds. This should be
+        """Waits until the element specified by `locator` can be clicked, then clicks it once. This should be
         used with buttons that are generated in real-time and that don't have their click handling available
         immediately. This keyword avoids unclickable element exceptions.
 
+        The element can be clicked once it is visible, enabled, not covered by another element at its centre
+        and not moving anymore, which is checked in the browser without clicking it. Whether it is moving
+        isn't checked when the script timeout is too short to wait for the next animation frame.
+
         | =Argument= | =Description= | =Example= |
         | locator | Selenium 2 element locator(s) | id=MyId |
         | timeout | maximum time to wait, if set to ${None} it will use Selenium's default timeout | 5s |"""
 
-        self._wait_until_no_error(timeout, self._wait_for_click_to_succeed,
-                                  locator)
+        clickable = []
+        # the probe waits for the next animation frame, up to 100 ms, which
+        # must end before the script timeout of the driver
+        settle = [self._timeout_in_secs * 0.8 > 0.1]
+
+        def check_clickable():
+            try:
+                probe = self._probe_clickable(locator, settle[0])
+            except TimeoutException as e:
+                self._debug("Probing without waiting for the next frame, the browser couldn't wait: %s" % e)
+                settle[0] = False
+                probe = self._probe_clickable(locator, False)
+            if probe is None:
+                return "Couldn't find the element '%s', click operation failed" % locator
+
+            element, problems = probe
+            if problems:
+                return "Element '%s' was not clickable (%s), click operation failed" % (
+                    locator, ', '.join(problems))
+            clickable[:] = [element]
+
+        self._wait_until_no_error(timeout, check_clickable)
+        self._with_element(locator, lambda element: element.click(),
+                           clickable[0])
+
+    def set_wait_poll_schedule(self,
+                               interval,
+                               max_interval=None,
+                               backoff=None,
+                               jitter=None):
+        """Sets the poll schedule used by the `Wait Until ...` keywords and returns the previous one.
+        Arguments that are not given keep their current value. The returned value can be passed back
+        as `interval` to restore the previous schedule, which allows changing the schedule for a single keyword.
+
+        | =Argument= | =Description= | =Example= |
+        | interval | delay between the first polls | 10ms |
+        | max_interval | longest delay between two polls | 500ms |
+        | backoff | factor by which the delay grows after the first polls | 2 |
+        | jitter | random variation applied to each delay, as a fraction of the delay | 0.1 |
+
+        Example:
+        | ${previous}= | Set Wait Poll Schedule | 10ms | 100ms |
+        | Wait Until Element Has Focus | id=my_id |
+        | Set Wait Poll Schedule | ${previous} |"""
+
+        previous = self._poll_scheduler
+
+        if isinstance(interval, PollScheduler):
+            self._poll_scheduler = interval
+
+        else:
+            if max_interval is None:
+                max_interval = max(previous.max_interval,
+                                   robot.utils.timestr_to_secs(interval))
+            self._poll_scheduler = PollScheduler(
+                interval, max_interval,
+                previous.backoff if backoff is None else backoff,
+                previous.jitter if jitter is None else jitter,
+                previous.fast_polls)
+
+        self._info("Wait poll schedule set to %s" % self._poll_scheduler)
+        return previous
 
     def register_webdriver(self, driver, alias=None):
         '''This lets you pass in a webdriver to the class instance for the library
@@ -390,21 +629,68 @@ class _keywords():
                     to the register" % (driver.name, driver.session_id))
         return self._cache.register(driver, alias)
 
+    def get_connection_pool_stats(self):
+        """Returns a dictionary with the number of commands sent to the browsers, of connections opened, reused,
+        retried because the server had closed them and discarded, and the number of idle connections. See
+        `Connection Pool`.
+
+        | ${stats}= | Get Connection Pool Stats |
+        | Should Be True | ${stats['reused']} > ${stats['opened']} |"""
+
+        stats = self._connection_pool.stats()
+        self._info(', '.join("%s=%s" % item for item in sorted(stats.items())))
+        return stats
+
+    def get_element_cache_stats(self):
+        """Returns a dictionary with the number of element lookups which used the cache (`hits`), which resolved their
+        locator (`misses`) and, among the latter, the ones whose cached elements were stale, and the number of cached
+        locators. See `Element Cache`.
+
+        | Element Value Should Be | id=name | John |
+        | Element Width Should Be | id=name | 200 |
+        | ${stats}= | Get Element Cache Stats |
+        | Should Be Equal As Integers | ${stats['hits']} | 1 |"""
+
+        stats = self._element_cache.stats()
+        self._info(', '.join("%s=%s" % item for item in sorted(stats.items())))
+        return stats
+
+    def get_stale_element_stats(self):
+        """Returns a dictionary with the number of times the elements used by the keywords went stale (`stale`),
+        of steps which succeeded once their element was found again (`recovered`) and of steps which failed after
+        `stale_element_retries` retries (`exhausted`). See `Stale Elements`.
+
+        | ${stats}= | Get Stale Element Stats |
+        | Should Be Equal As Integers | ${stats['exhausted']} | 0 |"""
+
+        self._info(self._format_stale_element_stats())
+        return dict(self._stale_element_stats)
+
+    def get_command_count(self):
+        """Returns the number of commands sent to the browsers during the current test. The library must be
+        imported with a `command_trace`, see `Command Trace`.
+
+        | ${before}= | Get Command Count |
+        | Select From List By Text | id=country | France |
+        | ${after}= | Get Command Count |
+        | Should Be True | ${after} - ${before} <= 3 |"""
+
+        if not self._command_tracer:
+            raise RuntimeError("Commands are only counted when the library is "
+                               "imported with a command_trace")
+        return self._command_tracer.count()
+
     def undo(self):
         """
         Simulate a CTRL+Z keypress
         """
-        driver = self._current_browser()
-        ActionChains(driver).key_down(Keys.CONTROL).send_keys('z').key_up(
-            Keys.CONTROL).perform()
+        self._play_key_macro(_UNDO)
 
     def redo(self):
         """
         Simulate a CTRL+Y keypress
         """
-        driver = self._current_browser()
-        ActionChains(driver).key_down(Keys.CONTROL).send_keys('y').key_up(
-            Keys.CONTROL).perform()
+        self._play_key_macro(_REDO)
 
     def clear_field(self, locator):
         """
@@ -415,11 +701,8 @@ class _keywords():
         2. Press Ctrl + A key combination. (Select All)
         3. Press Delete key.
         """
-        driver = self._current_browser()
-        field = self._element_find(locator, True, True)
-        field.click()
-        ActionChains(driver).key_down(Keys.CONTROL).send_keys('a').key_up(
-            Keys.CONTROL).send_keys(Keys.DELETE).perform()
+        self._with_element(locator, lambda field: field.click())
+        self._play_key_macro(_SELECT_ALL_AND_DELETE)
 
     def send_keys(self, key, case=None):
         """
@@ -429,7 +712,7 @@ class _keywords():
         if case == 'lower':
             key = key.lower()
 
-        ActionChains(self._current_browser()).send_keys(key).perform()
+        self._play_key_macro(KeyMacro('text:' + key))
 
     def get_child(self, locator, xpath="/*[1]"):
         """
@@ -440,14 +723,16 @@ class _keywords():
         RETURNS:
         WebElement - first WebElement to match on xpath
         """
-        element = self._element_find(locator, True, True)
-        try:
-            child = element.find_element_by_xpath("." + xpath)
-        except:
-            raise AssertionError("No Element was found by relative XPath %s" %
-                                 (xpath))
+        def find_child(element):
+            try:
+                return element.find_element_by_xpath("." + xpath)
+            except StaleElementReferenceException:
+                raise
+            except:
+                raise AssertionError(
+                    "No Element was found by relative XPath %s" % (xpath))
 
-        return child
+        return self._with_element(locator, find_child)
 
     def get_children(self, locator, xpath="/*"):
         """
@@ -458,8 +743,9 @@ class _keywords():
         RETURNS:
         WebElements - list of WebElements to match on xpath
         """
-        element = self._element_find(locator, True, True)
-        return element.find_elements_by_xpath("." + xpath)
+        return self._with_element(
+            locator,
+            lambda element: element.find_elements_by_xpath("." + xpath))
 
     def wait_for_element_to_come_and_go(self, xpath_for_element, timeout=None):
         '''
@@ -481,10 +767,7 @@ class _keywords():
         """
         Return True if element found by 'locator' has focus.
         """
-        driver = self._current_browser()
-        element = self._element_find(locator, True, True)
-        focus = driver.switch_to.active_element == element
-        return focus
+        return self._element_focus(locator)
 
     def wait_until_box_is_changed(self, checkbox, checked=True, timeout=None):
         """This waits for the given checkbox to become checked or unchecked."""
@@ -507,22 +790,28 @@ class _keywords():
     def element_exists(self, locator):
         """Returns True if the given element exists.
         This is useful when you want to check if an element is on
-        a page without a test fail condition."""
+        a page without a test fail condition. The implicit wait is
+        not applied, so a missing element is reported right away."""
 
         try:
-            self.get_webelement(locator)
-            return True
+            return self._count_elements(locator, 1) > 0
         except:
             return False
 
-    def num_elements_on_page(self, locator):
+    def num_elements_on_page(self, locator, limit=None):
         """
         This does the same thing as len(self.get_webelements(locator))
         with one exception.  It returns a 0 instead of throwing an
         exception when no elements are found.
+        The implicit wait is not applied to this lookup.
+
+        The elements are counted in the browser when possible, so the
+        count is cheap even with thousands of matches. When `limit` is
+        given, counting stops after `limit` elements, which is enough
+        to check that there are at least `limit` of them.
         """
         try:
-            return len(self.get_webelements(locator))
+            return self._count_elements(locator, limit)
         except:
             return 0
 
@@ -548,7 +837,46 @@ class _keywords():
 
         RETURN: (new, value)
         new - the new WebElement matched by the xpath
-        value - the return value of creator(*args)"""
+        value - the return value of creator(*args)
+
+        The existing matches are marked in the page before running the
+        creator, so that finding the new one takes a single call per poll
+        whatever the number of existing matches."""
+        browser_locator = to_browser_locator(xpath)
+        if browser_locator is None:
+            return self._get_created_by_comparison(xpath, creator, *args)
+
+        browser = self._current_browser()
+        token = uuid.uuid4().hex
+        if not runtime.call(browser, 'markElements', browser_locator, token):
+            logger.info("There were no existing matches.")
+
+        value = BuiltIn().run_keyword(creator, *args)
+
+        # Wait until there is a new match for the XPath
+        new = []
+
+        def find_new():
+            new[:] = runtime.call(browser, 'findUnmarked', browser_locator,
+                                  token, False)
+            if not new:
+                return "Never found a new element matching XPath: " + xpath
+
+        try:
+            self._wait_until_no_error(None, find_new)
+        finally:
+            if not new:
+                try:
+                    runtime.call(browser, 'findUnmarked', browser_locator,
+                                 token, True)
+                except WebDriverException:
+                    pass
+
+        return (new[0], value)
+
+    def _get_created_by_comparison(self, xpath, creator, *args):
+        """`Get Created` for locators that can't be resolved in the browser:
+        compares the matches found before and after running the creator."""
         old_list = []
         try:
             # Get existing elements
@@ -559,7 +887,6 @@ class _keywords():
         value = BuiltIn().run_keyword(creator, *args)
 
         # Wait until there is a new match for the XPath
-        timeout = time.time() + self._timeout_in_secs
         self.wait_until_page_contains_element(
             xpath, None, "Never found a new element matching XPath: " + xpath)
         new_list = self.get_webelements(xpath)
@@ -573,20 +900,24 @@ class _keywords():
                                      error=None):
         """
         Wait until an element identified by 'locator' has the class 'expected'.
+        Several classes can be given separated by spaces, the element must then
+        have all of them.
         """
 
+        classes = expected.split()
+
         def check_class():
-            element = self._element_find(locator, True, False)
-            actual = element.get_attribute("class").split(" ")
-            if expected in actual:
+            found = self._element_classes([locator], classes, False)[0]
+            if found is not None and all(found[1]):
                 return
             else:
                 return error or "Class '%s' did not appear in %s to element '%s'. " \
                     "Its class(es) was '%s'." % (expected,
                                                  self._format_timeout(timeout),
-                                                 locator, actual)
+                                                 locator, found and found[0])
 
-        self._wait_until_no_error(timeout, check_class)
+        self._wait_until_in_browser(timeout, 'has_class', [locator],
+                                    [classes, True], check_class)
 
     def wait_until_element_does_not_have_class(self,
                                                locator,
@@ -594,36 +925,39 @@ class _keywords():
                                                timeout=None,
                                                error=None):
         """
-        Wait until an element identified by 'locator' has the class 'expected'.
+        Wait until an element identified by 'locator' does not have the class 'expected'.
+        Several classes can be given separated by spaces, the element must then
+        have none of them.
         """
 
+        classes = expected.split()
+
         def check_not_has_class():
-            element = self._element_find(locator, True, False)
-            actual = element.get_attribute("class").split(" ")
-            if expected not in actual:
+            found = self._element_classes([locator], classes, False)[0]
+            if found is not None and not any(found[1]):
                 return
             else:
                 return error or "Class '%s' still appeared after %s in element '%s'. " \
                     "Its class(es) were '%s'." % (expected,
                                                   self._format_timeout(
                                                       timeout),
-                                                  locator, actual)
+                                                  locator, found and found[0])
 
-        self._wait_until_no_error(timeout, check_not_has_class)
+        self._wait_until_in_browser(timeout, 'has_class', [locator],
+                                    [classes, False], check_not_has_class)
 
     def element_should_have_class(self, locator, expected, message=''):
         """
         Verify that element identified by 'locator' has the class 'expected'.
+        Several classes can be given separated by spaces, the element must then
+        have all of them.
         """
 
         self._info("Verifying element '%s' has class '%s'." %
                    (locator, expected))
-        element = self._element_find(locator, True, False)
-        actual = element.get_attribute("class").split(" ")
-        # The reason I don't use _has_class() here is because I still want to
-        # include 'actual' in the error message, but I don't want to pass this
-        # to or from _has_class().
-        if not expected in actual:
+        actual, present = self._element_classes([locator], expected.split())[0]
+
+        if not all(present):
             if not message:
                 message = "Element '%s' should have had class '%s' but "\
                           "its class(es) was '%s'." % (
@@ -633,14 +967,15 @@ class _keywords():
     def element_should_not_have_class(self, locator, expected, message=''):
         """
         Verify that element identified by 'locator' does not have the class 'expected'.
+        Several classes can be given separated by spaces, the element must then
+        have none of them.
         """
 
-        self._info("Verifying element '%s' has class '%s'." %
+        self._info("Verifying element '%s' does not have class '%s'." %
                    (locator, expected))
-        element = self._element_find(locator, True, False)
-        actual = element.get_attribute("class").split(" ")
+        actual, present = self._element_classes([locator], expected.split())[0]
 
-        if expected in actual:
+        if any(present):
             if not message:
                 message = "Element '%s' should not have had class '%s' but "\
                           "its class(es) was '%s'." % (
@@ -649,66 +984,263 @@ class _keywords():
 
     def validate_field_is_not_editable(self, locator):
         """Checks that the field found by the given locator is not editable."""
-        field = self._element_find(locator, True, True)
-        original_text = field.text
-        self.add_text_to_prompt_field(field, "This Text Shouldn't make it")
-        BuiltIn().should_be_equal_as_strings(
-            field.text, original_text,
-            "The field proved to be editable, even though it was marked.")
+
+        def check_not_editable(field):
+            original_text = field.text
+            self.add_text_to_prompt_field(field, "This Text Shouldn't make it")
+            BuiltIn().should_be_equal_as_strings(
+                field.text, original_text,
+                "The field proved to be editable, even though it was marked.")
+
+        self._with_element(locator, check_not_editable)
 
     def _has_class(self, locator, expected):
         """
         Returns True if give element has the specified class.
         """
-        # TODO make this an instance method of the WebElement class
-        element = self._element_find(locator, True, False)
-        actual = element.get_attribute("class").split(" ")
-        if expected in actual:
-            return True
-        else:
-            return False
-
-    def select_from_list_by_text(self, locator, text):
+        found = self._element_classes([locator], expected.split(), False)[0]
+        return found is not None and all(found[1])
+
+    def select_from_list_by_text(self,
+                                 locator,
+                                 text,
+                                 match='exact',
+                                 select_in_browser=False):
         """
         Selects `text` option from the list located by `locator`.
+
+        The option is looked up in the browser in a single call, whatever the
+        number of options, and then clicked. When `select_in_browser` is true,
+        the same call also selects the option and fires the `input` and `change`
+        events of the list, instead of clicking the option.
+
+        | =Argument= | =Description= | =Example= |
+        | locator | Selenium 2 element locator | id=my_id |
+        | text | text of the option to select | Canada |
+        | match | `exact`, `normalized` (whitespace is collapsed before comparing) or `partial` (the option contains `text`) | exact |
+        | select_in_browser | boolean, selects the option in the same call as its lookup | ${True} / ${False} |
         """
-        element = self._element_find(locator, True, True)
-        options = element.find_elements_by_xpath(".//option")
-        option_texts = [option.text for option in options]
-        option_index = option_texts.index(text)
-        self.select_from_list_by_index(element, str(option_index))
+        if match not in ('exact', 'normalized', 'partial'):
+            raise ValueError("Match should be 'exact', 'normalized' or "
+                             "'partial', got '%s'" % match)
+
+        self._info("Selecting option '%s' from list '%s'" % (text, locator))
+
+        def select(target):
+            options = runtime.call(self._current_browser(), 'findOptionByText',
+                                   target, text, match, bool(select_in_browser))
+
+            if options is None:
+                raise ValueError("Element locator '%s' did not match any "
+                                 "elements." % locator)
+            if not options:
+                raise ValueError("List '%s' has no option matching '%s' (%s "
+                                 "match)" % (locator, text, match))
+
+            if not select_in_browser and not options[0].is_selected():
+                options[0].click()
+
+        self._with_target(locator, select)
 
     def get_webelements_return_empty_for_none(self, locator):
         """Don't want to fail if 'get_webelements' find none"""
         try:
-            return self.get_webelements(locator)
+            with self._implicit_wait_suspended():
+                return self.get_webelements(locator)
         except:
             return []
 
     # HELPER METHODS
+    def _retry_stale(self, locator, step):
+        """Returns `step()`, which finds the element(s) identified by `locator` and acts on them. The step is run
+        again, finding the elements again, when they go stale, up to the `stale_element_retries` of the library.
+        See `Stale Elements`."""
+
+        stats = self._stale_element_stats
+        retries = 0
+        while True:
+            try:
+                result = step()
+            except StaleElementReferenceException:
+                stats['stale'] += 1
+                if retries >= self._stale_element_retries:
+                    stats['exhausted'] += 1
+                    self._warn("Element '%s' was still stale after %d retries (stale elements: %s)" % (
+                        locator, retries, self._format_stale_element_stats()))
+                    raise
+                retries += 1
+                continue
+
+            if retries:
+                stats['recovered'] += 1
+                self._info("Element '%s' was stale, found it again after %d retries (stale elements: %s)" % (
+                    locator, retries, self._format_stale_element_stats()))
+            return result
+
+    def _with_element(self, locator, action, element=None):
+        """Returns `action(element)` for the first element identified by `locator`, which is required. `element`,
+        when given, is the one used first, the locator is only resolved when it goes stale."""
+
+        elements = [element] if element is not None else []
+
+        def step():
+            found = elements.pop() if elements else \
+                self._element_find(locator, True, True)
+            return action(found)
+
+        return self._retry_stale(locator, step)
+
+    def _with_target(self, locator, action, required=True):
+        """Returns `action(target)`, `target` being the `[strategy, criteria]` pair of `locator` for the in-browser
+        scripts, or its first element when the locator can only be resolved from Python. Returns None when that
+        element isn't found and not `required`."""
+
+        def step():
+            target = to_browser_locator(locator)
+            if target is None:
+                target = self._element_find(locator, True, required)
+                if target is None:
+                    return None
+            return action(target)
+
+        return self._retry_stale(locator, step)
+
+    def _targets(self, locators, required=True):
+        """Returns the targets (see `_with_target`) of all of the `locators`, None for the missing elements that
+        aren't `required`."""
+
+        targets = []
+        for locator in locators:
+            browser_locator = to_browser_locator(locator)
+            targets.append(browser_locator if browser_locator is not None else
+                           self._element_find(locator, True, required))
+        return targets
+
+    def _format_stale_element_stats(self):
+        return ', '.join("%s=%s" % item for item in
+                         sorted(self._stale_element_stats.items()))
+
+    @contextmanager
+    def _implicit_wait_suspended(self):
+        """Disables the implicit wait of the current browser for the lookups done inside the
+        `with` block, so that looking for an element that isn't there returns right away.
+        The implicit wait of the browser is restored when the outermost block exits, even on errors."""
+
+        suspend = bool(self._cache.current) and not self._implicit_wait_suspensions
+        if suspend:
+            browser = self._current_browser()
+            wait = self._browser_implicit_wait(browser)
+            suspend = bool(wait)
+
+        if suspend:
+            browser.implicitly_wait(0)
+
+        self._implicit_wait_suspensions += 1
+        try:
+            yield
+        finally:
+            self._implicit_wait_suspensions -= 1
+            if suspend:
+                browser.implicitly_wait(wait)
+
+    def _browser_implicit_wait(self, browser):
+        """Returns the implicit wait of `browser`, which is the one of the library unless it was set with
+        `Set Browser Implicit Wait`."""
+
+        return self._implicit_waits.get(browser, self._implicit_wait_in_secs)
+
+    def _wait_until_in_browser(self, timeout, condition, locators, args,
+                               wait_func, *wait_args):
+        """Waits for `condition` (see `scripts.CONDITIONS`) to be met inside the browser,
+        which observes the page and returns as soon as the condition is met instead of being polled.
+
+        `wait_func` is the equivalent Python check: it is polled when the browser can't do the wait
+        (custom locators, browsers without MutationObserver, script timeout...) and it is called one last
+        time when the wait expires in order to report the error."""
+
+        timeout = robot.utils.timestr_to_secs(
+            timeout) if timeout is not None else self._timeout_in_secs
+        browser_locators = to_browser_locators(locators)
+
+        if self._in_browser_waits and browser_locators is not None:
+
+            maxtime = time.time() + timeout
+            browser = self._current_browser()
+            # the wait must end before the script timeout of the driver, and
+            # before the socket timeout of the connection it is sent over
+            max_duration = self._timeout_in_secs * 0.8
+            connection_timeout = self._connection_timeout()
+            if connection_timeout is not None:
+                max_duration = min(max_duration, connection_timeout * 0.8)
+
+            while True:
+
+                remaining = maxtime - time.time()
+                duration = max(0, min(remaining, max_duration))
+
+                try:
+                    met = runtime.call_async(
+                        browser, 'waitForCondition', browser_locators,
+                        condition, args, duration)
+                except (WebDriverException, socket.error, URLError) as e:
+                    self._debug("Waiting from Python, the browser couldn't wait: %s" % e)
+                    met = None
+
+                if met:
+                    return
+
+                # without script timeout, the browser can only check the
+                # condition once, the rest of the wait is polled from Python
+                if met is None or max_duration <= 0:
+                    timeout = max(0, maxtime - time.time())
+                    break
+
+                if time.time() >= maxtime:
+                    timeout = 0
+                    break
+
+        self._wait_until_no_error(timeout, wait_func, *wait_args)
+
+    def _connection_timeout(self):
+        """Returns the socket timeout of the commands sent to the browsers in seconds, or None when
+        they don't time out."""
+
+        timeout = self._connection_pool.timeout if self._connection_pool.size else None
+        if timeout is None:
+            timeout = RemoteConnection.get_timeout()
+        if timeout is None:
+            timeout = socket.getdefaulttimeout()
+        return timeout
+
+    def _element_focus(self, locator, required=True):
+        """Returns whether the element identified by `locator` has focus, or None when it isn't found
+        and not `required`. The element is found and compared to the active element in the browser,
+        in a single call unless `locator` can only be resolved from Python."""
+
+        focused = self._with_target(
+            locator, lambda target: runtime.call(self._current_browser(),
+                                                 'elementFocus', target),
+            required)
+        if focused is None and required:
+            raise ValueError("Element locator '%s' did not match any elements." % locator)
+        return focused
+
     def _check_element_focus_exp(self, set, locator, timeout=None):
 
-        if set:
-            element = self._element_find(locator, True, False)
-            if not element:
-                return "Element locator '%s' did not match any elements after %s" % (
-                    locator, self._format_timeout(timeout))
+        focused = self._element_focus(locator, False)
+        if focused is None:
+            return "Element locator '%s' did not match any elements after %s" % (
+                locator, self._format_timeout(timeout))
 
-            driver = self._current_browser()
-            if element == driver.switch_to.active_element:
+        if set:
+            if focused:
                 return
             else:
                 return "Element '%s' did not get focus after %s" % (
                     locator, self._format_timeout(timeout))
 
         else:
-            element = self._element_find(locator, True, False)
-            if not element:
-                return "Element locator '%s' did not match any elements after %s" % (
-                    locator, self._format_timeout(timeout))
-
-            driver = self._current_browser()
-            if element != driver.switch_to.active_element:
+            if not focused:
                 return
             else:
                 return "Element '%s' still had focus after %s while it shouldn't have" % (
@@ -722,13 +1254,17 @@ class _keywords():
                                      strip=False,
                                      timeout=None):
 
-        if partial:
+        def read_attribute():
             element = self._element_find(locator, True, False)
-            if not element:
-                return "Element locator '%s' did not match any elements after %s" % (
-                    locator, self._format_timeout(timeout))
+            return (element.get_attribute(attribute_name),) if element else None
+
+        found = self._retry_stale(locator, read_attribute)
+        if not found:
+            return "Element locator '%s' did not match any elements after %s" % (
+                locator, self._format_timeout(timeout))
 
-            attribute = str(element.get_attribute(attribute_name))
+        if partial:
+            attribute = str(found[0])
 
             if (strip):
                 attribute = attribute.strip()
@@ -741,12 +1277,7 @@ class _keywords():
                     locator, attribute_name, attribute)
 
         else:
-            element = self._element_find(locator, True, False)
-            if not element:
-                return "Element locator '%s' did not match any elements after %s" % (
-                    locator, self._format_timeout(timeout))
-
-            attribute = element.get_attribute(attribute_name)
+            attribute = found[0]
 
             if (strip):
                 attribute = attribute.strip()
@@ -758,12 +1289,138 @@ class _keywords():
                     locator, attribute_name, expected,
                     self._format_timeout(timeout))
 
-    def _check_element_focus(self, set, locator):
+    def _clear_field_in_browser(self, locator):
+
+        result = self._with_target(
+            locator, lambda target: runtime.call(self._current_browser(),
+                                                 'clearField', target))
+        if result is None:
+            raise ValueError("Element locator '%s' did not match any elements."
+                             % locator)
+
+        editable, value = result
+        if not editable:
+            raise AssertionError("Element '%s' is read-only or disabled" %
+                                 locator)
+        if value:
+            raise AssertionError(
+                "Element '%s' could not be cleared, its value is '%s'" %
+                (locator, value))
+
+    def _element_snapshots(self, locators, styles=(), required=True):
+        """Returns the snapshots (see `Get Element Snapshot`) of the elements identified
+        by `locators` with the given css `styles`, fetched in a single script call.
+
+        Locators that can't be resolved in the browser are found from Python first.
+        Missing elements raise an error when `required`, otherwise their snapshot is None."""
+
+        def snapshot():
+            return runtime.call(self._current_browser(), 'elementSnapshots',
+                                self._targets(locators, required), list(styles))
+
+        snapshots = self._retry_stale(
+            ', '.join(str(locator) for locator in locators), snapshot)
+
+        for locator, snapshot in zip(locators, snapshots):
+            if snapshot is None and required:
+                raise ValueError("Element locator '%s' did not match any elements."
+                                 % locator)
+
+        return snapshots
+
+    def _element_classes(self, locators, expected=(), required=True):
+        """Returns, for each of the elements identified by `locators`, its classes and whether
+        it has each of the `expected` classes, checked with classList in a single script call.
+
+        Locators that can't be resolved in the browser are found from Python first.
+        Missing elements raise an error when `required`, otherwise their result is None."""
+
+        def classes():
+            return runtime.call(self._current_browser(), 'elementClasses',
+                                self._targets(locators, required),
+                                list(expected))
+
+        results = self._retry_stale(
+            ', '.join(str(locator) for locator in locators), classes)
+
+        for locator, result in zip(locators, results):
+            if result is None and required:
+                raise ValueError("Element locator '%s' did not match any elements."
+                                 % locator)
+
+        return [tuple(result) if result is not None else None
+                for result in results]
+
+    def _check_snapshot_property(self, locator, prop, expected, snapshot):
+        """Asserts that the property `prop` (see `Elements Should Match`) of the
+        element `snapshot` has the `expected` value."""
+
+        if snapshot is None:
+            raise AssertionError(
+                "Element locator '%s' did not match any elements." % locator)
+
+        if prop == 'value':
+            self._check_element_value(locator, expected, snapshot=snapshot)
+
+        elif prop == 'text':
+            if snapshot['text'] != expected:
+                raise AssertionError(
+                    "Element '%s' text was not '%s', it was '%s'" %
+                    (locator, expected, snapshot['text']))
+
+        elif prop == 'class':
+            if not set(expected.split()) <= set(snapshot['classes']):
+                raise AssertionError(
+                    "Element '%s' should have had class '%s' but "
+                    "its class(es) was '%s'." %
+                    (locator, expected, snapshot['classes']))
+
+        elif prop in ('width', 'height'):
+            self._check_element_size(locator, prop, expected, snapshot)
+
+        elif prop == 'focus':
+            self._check_element_focus(
+                str(expected).lower() == 'true', locator, snapshot)
+
+        elif prop == 'visible':
+            if snapshot['visible'] != (str(expected).lower() == 'true'):
+                raise AssertionError(
+                    "Element '%s' visibility should have been '%s'" %
+                    (locator, expected))
+
+        elif prop.startswith('css:'):
+            self._check_element_css_value(locator, prop[4:], expected,
+                                          snapshot)
+
+        else:
+            raise AssertionError("Unknown property '%s' for element '%s'" %
+                                 (prop, locator))
+
+    def _check_element_value(self, locator, expected, strip=False,
+                             snapshot=None):
+
+        if snapshot is not None:
+            value = snapshot['value']
+        else:
+            value = self._with_element(
+                locator, lambda element: element.get_attribute('value'))
+
+        if (strip):
+            value = value.strip()
+
+        if str(value) != expected:
+            raise AssertionError("Element '%s' value was not '%s', it was '%s'"
+                                 % (locator, expected, value))
+
+    def _check_element_focus(self, set, locator, snapshot=None):
+
+        if snapshot is not None:
+            focused = snapshot['focused']
+        else:
+            focused = self._element_focus(locator)
 
         if set:
-            element = self._element_find(locator, True, True)
-            driver = self._current_browser()
-            if element == driver.switch_to.active_element:
+            if focused:
                 return
             else:
                 raise AssertionError(
@@ -771,48 +1428,96 @@ class _keywords():
                     locator)
 
         else:
-            element = self._element_find(locator, True, True)
-            driver = self._current_browser()
-            if element != driver.switch_to.active_element:
+            if not focused:
                 return
             else:
                 raise AssertionError(
                     "Element '%s' had focus while it shouldn't have" % locator)
 
-    def _check_element_css_value(self, locator, prop, expected):
+    def _check_element_css_value(self, locator, prop, expected, snapshot=None):
 
-        element = self._element_find(locator, True, True)
+        if snapshot is not None:
+            value = snapshot['styles'][prop]
+        else:
+            value = self._with_element(
+                locator, lambda element: element.value_of_css_property(prop))
 
-        value = element.value_of_css_property(prop)
         if (value != expected):
             raise AssertionError(
                 "Element locator '%s' css property '%s' had a value of '%s' while it should have been '%s'"
                 % (locator, prop, value, expected))
 
-    def _check_element_size(self, locator, type, expected):
+    def _check_element_size(self, locator, type, expected, snapshot=None):
 
-        element = self._element_find(locator, True, True)
+        if snapshot is not None:
+            size = str(snapshot['size'].get(type))
+        else:
+            size = str(self._with_element(
+                locator, lambda element: element.size.get(type)))
 
-        size = str(element.size.get(type))
         if size != expected:
             raise AssertionError(
                 "The %s of element '%s' should have been '%s' but in fact it was '%s'"
                 % (type, locator, expected, size))
 
+    def _count_elements(self, locator, limit=None):
+        """Returns the number of elements matching `locator`, up to `limit` if given.
+
+        Locators that can be resolved in the browser are counted by a script that returns
+        only the number, without sending a reference to every element. The other ones are
+        found from Python. The implicit wait isn't used in both cases."""
+
+        limit = int(limit) if limit else 0
+        browser_locator = to_browser_locator(locator)
+
+        if browser_locator is not None:
+            return int(runtime.call(self._current_browser(), 'countElements',
+                                    browser_locator, limit))
+
+        with self._implicit_wait_suspended():
+            count = len(self.get_webelements(locator))
+        return min(count, limit) if limit else count
+
+    def _find_presence(self, locators, optional=False):
+        """Yields, in order, each locator with whether it matches at least one element.
+
+        All the locators that can be resolved in the browser are evaluated in a single
+        script call returning their presence bitmap. The other ones (custom strategies,
+        WebElements...) are looked up one by one, only when the caller asks for them.
+        These lookups don't use the implicit wait when `optional` is true, which should
+        be the case when the absence of the elements is expected or harmless."""
+
+        browser_locators = [to_browser_locator(locator) for locator in locators]
+        batch = [locator for locator in browser_locators if locator is not None]
+        bitmap = iter(
+            runtime.call(self._current_browser(), 'findPresence', batch)
+            if batch else [])
+
+        for locator, browser_locator in zip(locators, browser_locators):
+
+            if browser_locator is not None:
+                yield locator, next(bitmap)
+            elif optional:
+                with self._implicit_wait_suspended():
+                    element = self._element_find(locator, True, False)
+                yield locator, element is not None
+
+            else:
+                yield locator, self._element_find(locator, True,
+                                                  False) is not None
+
     def _wait_for_elements(self, locators):
 
-        for locator in locators:
+        for locator, present in self._find_presence(locators):
 
-            element = self._element_find(locator, True, False)
-            if not element:
+            if not present:
                 return "Element '%s' couldn't be found" % locator
 
     def _wait_for_at_least_one_element(self, locators):
 
-        for locator in locators:
+        for locator, present in self._find_presence(locators, True):
 
-            element = self._element_find(locator, True, False)
-            if element is not None:
+            if present:
                 return
 
         return "Couldn't find any of the expected elements from '%s'" % str(
@@ -827,27 +1532,38 @@ class _keywords():
 
     def _wait_for_element_to_go_away(self, locator):
         """Simpler implementation of Wait Until Page Does Not Contain Element"""
-        element = self._element_find(locator, True, False)
+        with self._implicit_wait_suspended():
+            element = self._element_find(locator, True, False)
         if element is not None:
             return "Element '%s' shouldn't have been there" % locator
 
     def _wait_for_elements_to_go_away(self, locators):
 
-        for locator in locators:
+        for locator, present in self._find_presence(locators, True):
 
-            element = self._element_find(locator, True, False)
-            if element is not None:
+            if present:
                 return "Element '%s' shouldn't have been there" % locator
 
-    def _wait_for_click_to_succeed(self, locator):
-        """Clicks an element until there is no error (created to avoid click errors on periodically unclickable elements"""
-        element = self._element_find(locator, True, False)
-        if not element:
-            return "Couldn't find the element '%s', click operation failed" % locator
+    def _play_key_macro(self, macro):
+        macro.play(self._current_browser())
+
+    def _probe_clickable(self, locator, settle=True):
+        """Returns the element identified by `locator` and the reasons why it can't be clicked yet
+        (see `scripts.CLICKABILITY`), or None when it isn't found. Unless `settle`, the probe is
+        synchronous and doesn't check whether the element is moving."""
 
-        element.click()
+        call = runtime.call_async if settle else runtime.call
+        probe = self._with_target(
+            locator, lambda target: call(self._current_browser(),
+                                         'clickability', target, settle),
+            False)
+        if probe is None:
+            return None
+        return probe[0], probe[1]
 
     def blur(self, locator):
         """Removes focus from element identified by `locator`."""
-        element = self._element_find(locator, True, True)
-        self._current_browser().execute_script("arguments[0].blur();", element)
+        self._with_element(
+            locator,
+            lambda element: runtime.call(self._current_browser(), 'blur',
+                                         element))
@@ -3,9 +3,12 @@
 import time
 import robot
 from Selenium2Library import Selenium2Library
+from Selenium2LibraryExtension.utils import PollScheduler
 
 class _patches():
 
+	_default_poll_scheduler = PollScheduler()
+
 	def __init__(self):
 	
 		pass
@@ -21,10 +24,14 @@ class _patches():
 		self._wait_until_no_error_exp(timeout, wait_func)
 
 	def _wait_until_no_error_exp(self, timeout, wait_func, *args):
-		"""This replaces the method from Selenium2Library to fix the major logic error in it"""
+		"""This replaces the method from Selenium2Library to fix the major logic error in it.
+		The delay between two polls is given by the library's poll scheduler (see `Set Wait Poll Schedule`)"""
 	
 		timeout = robot.utils.timestr_to_secs(timeout) if timeout is not None else self._timeout_in_secs
 		maxtime = time.time() + timeout
+		scheduler = getattr(self, '_poll_scheduler', None) or _patches._default_poll_scheduler
+		profiler = getattr(self, '_keyword_profiler', None)
+		attempt = 0
 		
 		while True:
 		
@@ -32,7 +39,6 @@ class _patches():
 				timeout_error = wait_func(*args)
 				if not timeout_error: return
 				if time.time() > maxtime: raise AssertionError(timeout_error)
-				time.sleep(0.2)
 				
 			except AssertionError:
 			
@@ -41,8 +47,12 @@ class _patches():
 			except:
 			
 				if time.time() > maxtime: raise
-				continue
+				
+			delay = scheduler.delay(attempt, maxtime - time.time())
+			time.sleep(delay)
+			if profiler: profiler.slept(delay)
+			attempt += 1
 		
 	# patches here
 	Selenium2Library._wait_until = _wait_until_exp
-	Selenium2Library._wait_until_no_error = _wait_until_no_error_exp
\ No newline at end of file
+	Selenium2Library._wait_until_no_error = _wait_until_no_error_exp
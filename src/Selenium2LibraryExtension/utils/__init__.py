@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+from Selenium2LibraryExtension.utils.pollscheduler import PollScheduler
+from Selenium2LibraryExtension.utils.keymacro import KeyMacro
+from Selenium2LibraryExtension.utils.connectionpool import ConnectionPool
+from Selenium2LibraryExtension.utils.commandtracer import CommandTracer
+from Selenium2LibraryExtension.utils.keywordprofiler import KeywordProfiler
+from Selenium2LibraryExtension.utils.sessionpool import (PooledBrowserCache,
+                                                         SessionPool)
+from Selenium2LibraryExtension.utils.elementcache import ElementCache
+from Selenium2LibraryExtension.utils.locators import (to_browser_locator,
+                                                      to_browser_locators)
+from Selenium2LibraryExtension.utils import runtime, scripts
+
+__all__ = [
+    "PollScheduler",
+    "KeyMacro",
+    "ConnectionPool",
+    "CommandTracer",
+    "KeywordProfiler",
+    "PooledBrowserCache",
+    "SessionPool",
+    "ElementCache",
+    "to_browser_locator",
+    "to_browser_locators",
+    "runtime",
+    "scripts"
+]
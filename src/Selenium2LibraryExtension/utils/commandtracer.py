@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+import json
+import math
+import os
+import random
+import time
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+from selenium.webdriver.remote import utils
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+
+def percentile(values, percent):
+    """Returns the `percent` percentile of `values` (nearest rank)."""
+
+    if not values:
+        return None
+    values = sorted(values)
+    rank = int(math.ceil(percent / 100.0 * len(values)))
+    return values[max(0, min(rank, len(values)) - 1)]
+
+
+class _Aggregate(object):
+    """Running summary of commands: their number, by name too, their total
+    latency and payload, and the latencies of up to `sample_size` of them for
+    the percentiles, a uniform sample of them beyond."""
+
+    sample_size = 1000
+
+    def __init__(self):
+
+        self.commands = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.counts = {}
+        self.latencies = []
+
+    def add(self, command, seconds, size):
+
+        self.commands += 1
+        self.seconds += seconds
+        self.bytes += size
+        self.counts[command] = self.counts.get(command, 0) + 1
+        if len(self.latencies) < self.sample_size:
+            self.latencies.append(seconds)
+        else:
+            index = random.randrange(self.commands)
+            if index < self.sample_size:
+                self.latencies[index] = seconds
+
+    def summary(self):
+        """Returns the number of commands, their total and percentile
+        latencies in seconds and their total payload in bytes."""
+
+        return {
+            'commands': self.commands,
+            'seconds': self.seconds,
+            'p50': percentile(self.latencies, 50),
+            'p95': percentile(self.latencies, 95),
+            'p99': percentile(self.latencies, 99),
+            'bytes': self.bytes
+        }
+
+
+class _ObservedCommands(object):
+    """Mixin of the RemoteConnection classes which reports every command to
+    the `_command_observers`."""
+
+    def execute(self, command, params):
+
+        start = time.time()
+        response = super(_ObservedCommands, self).execute(command, params)
+        seconds = time.time() - start
+        for observer in self._command_observers:
+            observer.command_executed(command, seconds, params, response)
+        return response
+
+
+_observed_classes = {}
+
+
+def observe_commands(driver, observer):
+    """Makes `observer.command_executed(command, seconds, params, response)`
+    called after every command sent by `driver`."""
+
+    executor = driver.command_executor
+    if not isinstance(executor, RemoteConnection):
+        return
+
+    if not isinstance(executor, _ObservedCommands):
+        base = type(executor)
+        if base not in _observed_classes:
+            _observed_classes[base] = type('Observed' + base.__name__,
+                                           (_ObservedCommands, base), {})
+        executor.__class__ = _observed_classes[base]
+        executor._command_observers = []
+
+    if observer not in executor._command_observers:
+        executor._command_observers.append(observer)
+
+
+class CommandTracer(object):
+    """Library listener recording the commands sent to the browsers, with
+    their latency and payload size, under the keyword and the test that sent
+    them. The summaries of the keywords are logged when they end, the one of
+    the test when it ends, and all of them are written to `output` as JSON
+    when the execution ends. A relative `output` is relative to the output
+    directory of Robot Framework.
+
+    The commands aren't kept, only the running summaries of each test,
+    keyword and command name, so that the memory used doesn't grow with the
+    length of the execution."""
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, output='commands.json'):
+
+        self.output = output
+        self._keywords = []
+        self._test = None
+        self._total = _Aggregate()
+        self._groups = {'tests': {}, 'keywords': {}, 'commands': {}}
+        self._ended_tests = {}
+        self._calls = {}
+
+    def install(self, driver):
+        """Makes the commands of the `driver` recorded by the tracer."""
+
+        observe_commands(driver, self)
+
+    def command_executed(self, command, seconds, params, response):
+
+        size = len(utils.dump_json(params)) + len(utils.dump_json(response))
+        aggregates = [self._total, self._group('tests', self._test),
+                      self._group('commands', command)]
+        if self._keywords:
+            aggregates.append(self._group('keywords', self._keywords[-1][0]))
+        aggregates.extend(keyword[1] for keyword in self._keywords)
+        for aggregate in aggregates:
+            aggregate.add(command, seconds, size)
+
+    def count(self):
+        """Returns the number of commands sent during the current test, or
+        since the beginning of the execution outside of tests."""
+
+        test = self._groups['tests'].get(self._test or '')
+        return test.commands if test else 0
+
+    def start_test(self, name, attrs):
+        self._test = attrs['longname']
+
+    def end_test(self, name, attrs):
+        test = self._groups['tests'].pop(self._test or '', None)
+        if test:
+            logger.info("Test sent %s" % self._describe(test))
+            # only the summary of the ended test is kept
+            self._ended_tests[self._test] = test.summary()
+        self._test = None
+
+    def start_keyword(self, name, attrs):
+        self._keywords.append((name, _Aggregate()))
+        self._calls[name] = self._calls.get(name, 0) + 1
+
+    def end_keyword(self, name, attrs):
+        name, aggregate = self._keywords.pop()
+        if aggregate.commands:
+            logger.info("Keyword sent %s" % self._describe(aggregate))
+
+    def close(self):
+
+        output = self.output
+        if not os.path.isabs(output):
+            try:
+                output = os.path.join(
+                    BuiltIn().get_variable_value('${OUTPUT DIR}'), output)
+            except RobotNotRunningError:
+                pass
+
+        with open(output, 'w') as trace:
+            json.dump(self.summary(), trace, indent=2, sort_keys=True)
+        logger.info("Command trace written to %s" % output, also_console=True)
+
+    def summary(self):
+        """Returns the summaries of all the commands, by test, by keyword and
+        by command name."""
+
+        summary = {'total': self._total.summary()}
+        for group, aggregates in self._groups.items():
+            summary[group] = dict((name, aggregate.summary())
+                                  for name, aggregate in aggregates.items())
+        summary['tests'].update(self._ended_tests)
+
+        for name, keyword in summary['keywords'].items():
+            keyword['calls'] = self._calls.get(name, 0)
+            keyword['commands_per_call'] = \
+                float(keyword['commands']) / keyword['calls'] \
+                if keyword['calls'] else None
+
+        return summary
+
+    def _group(self, group, name):
+
+        aggregates = self._groups[group]
+        name = name or ''
+        if name not in aggregates:
+            aggregates[name] = _Aggregate()
+        return aggregates[name]
+
+    def _describe(self, aggregate):
+
+        stats = aggregate.summary()
+        return "%d WebDriver commands in %.0f ms (p50 %.1f ms, p95 %.1f ms, " \
+            "p99 %.1f ms): %s" % (
+                stats['commands'], stats['seconds'] * 1000,
+                stats['p50'] * 1000, stats['p95'] * 1000,
+                stats['p99'] * 1000,
+                ', '.join("%s x%d" % item
+                          for item in sorted(aggregate.counts.items(),
+                                             key=lambda item: -item[1])))
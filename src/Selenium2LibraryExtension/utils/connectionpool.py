@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+import errno
+import socket
+import threading
+import time
+
+try:
+    import http.client as httplib
+    from urllib import parse
+except ImportError:
+    import httplib
+    import urlparse as parse
+
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+
+def _tracking_sent(base):
+    """Returns a subclass of the HTTP connection class `base` whose `sent`
+    attribute tells whether its last request was fully sent."""
+
+    class Connection(base):
+
+        sent = False
+
+        def request(self, *args, **kwargs):
+            self.sent = False
+            base.request(self, *args, **kwargs)
+            self.sent = True
+
+    Connection.__name__ = 'Tracking' + base.__name__
+    return Connection
+
+
+_HTTPConnection = _tracking_sent(httplib.HTTPConnection)
+_HTTPSConnection = _tracking_sent(httplib.HTTPSConnection)
+
+
+def _closed_while_idle(connection, error):
+    """Returns whether `error` means that the server closed the idle
+    `connection` before handling the request, which can then be sent again
+    without running the command twice: the server closed it without any
+    response, or the request couldn't even be sent. Timeouts never are."""
+
+    if isinstance(error, socket.timeout):
+        return False
+    if isinstance(error, getattr(httplib, 'RemoteDisconnected', ())):
+        return True
+    if isinstance(error, httplib.BadStatusLine):
+        # Python 2 only tells by the message
+        return str(error.line).startswith('No status line received')
+    return not connection.sent and \
+        getattr(error, 'errno', None) in (errno.ECONNRESET, errno.EPIPE)
+
+
+class _PooledRequests(object):
+    """Mixin of the RemoteConnection classes which sends the commands over
+    the keep-alive connections of `_connection_pool`."""
+
+    def _request(self, method, url, body=None):
+
+        pool = self._connection_pool
+        parsed_url = parse.urlparse(url)
+        address = (parsed_url.scheme, parsed_url.hostname, parsed_url.port)
+
+        retried = False
+        while True:
+            connection, reused = pool.acquire(address, self._timeout)
+            # the keep-alive mode of RemoteConnection sends the request
+            # with self._conn and reads the whole response
+            self.keep_alive, self._conn = True, connection
+            try:
+                response = RemoteConnection._request(self, method, url, body)
+            except (httplib.HTTPException, socket.error) as e:
+                pool.discard(connection)
+                # the server may have closed the connection while it was
+                # idle, other errors may come after the command ran
+                if reused and not retried and _closed_while_idle(connection,
+                                                                 e):
+                    pool.count('retried')
+                    retried = True
+                    continue
+                raise
+            pool.release(address, connection)
+            return response
+
+
+class ConnectionPool(object):
+    """Pool of keep-alive HTTP connections to the WebDriver servers, shared
+    by the sessions it is installed in.
+
+    Up to `size` idle connections are kept for each server, and connections
+    idle for more than `idle_timeout` seconds are closed instead of being
+    reused. `timeout` is the socket timeout of the connections, the one of
+    Selenium is used when it is None."""
+
+    def __init__(self, size=4, timeout=None, idle_timeout=30.0):
+
+        self.size = int(size)
+        self.timeout = float(timeout) if timeout is not None else None
+        self.idle_timeout = float(idle_timeout)
+
+        if self.size < 0:
+            raise ValueError("Connection pool size should be positive, got "
+                             "'%s'" % self.size)
+
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._classes = {}
+        self._stats = dict.fromkeys(
+            ('requests', 'opened', 'reused', 'retried', 'discarded'), 0)
+
+    def install(self, driver):
+        """Makes the commands of the `driver` use the pool. Does nothing
+        when the pool is disabled or already installed."""
+
+        executor = driver.command_executor
+        if not self.size or not isinstance(executor, RemoteConnection) or \
+                isinstance(executor, _PooledRequests):
+            return
+
+        base = type(executor)
+        with self._lock:
+            if base not in self._classes:
+                self._classes[base] = type('Pooled' + base.__name__,
+                                           (_PooledRequests, base), {})
+        executor.__class__ = self._classes[base]
+        executor._connection_pool = self
+
+    def stats(self):
+        """Returns the number of requests sent, of connections opened, reused,
+        retried after the server closed them and discarded, and of idle
+        connections."""
+
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle'] = sum(len(idle) for idle in self._idle.values())
+        return stats
+
+    def count(self, stat):
+
+        with self._lock:
+            self._stats[stat] += 1
+
+    def acquire(self, address, timeout):
+        """Returns an idle connection to `address`, or a new one, and whether
+        it was reused."""
+
+        now = time.time()
+        with self._lock:
+            self._stats['requests'] += 1
+            idle = self._idle.get(address, [])
+            while idle:
+                connection, since = idle.pop()
+                if now - since <= self.idle_timeout:
+                    self._stats['reused'] += 1
+                    return connection, True
+                connection.close()
+            self._stats['opened'] += 1
+
+        scheme, host, port = address
+        connection_class = _HTTPSConnection if scheme == 'https' \
+            else _HTTPConnection
+        return connection_class(
+            host, port,
+            timeout=self.timeout if self.timeout is not None else timeout), \
+            False
+
+    def release(self, address, connection):
+        """Gives back a connection once its response has been read."""
+
+        # the server asked to close the connection
+        if connection.sock is None:
+            return self.discard(connection)
+
+        with self._lock:
+            idle = self._idle.setdefault(address, [])
+            if len(idle) < self.size:
+                idle.append((connection, time.time()))
+                return
+
+        self.discard(connection)
+
+    def discard(self, connection):
+
+        connection.close()
+        self.count('discarded')
+
+    def close_all(self):
+        """Closes all of the idle connections."""
+
+        with self._lock:
+            connections = [connection for idle in self._idle.values()
+                           for connection, since in idle]
+            self._idle.clear()
+
+        for connection in connections:
+            connection.close()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import OrderedDict
+
+from selenium.common.exceptions import (StaleElementReferenceException,
+                                        WebDriverException)
+
+from Selenium2LibraryExtension.utils import runtime
+from Selenium2LibraryExtension.utils.locators import to_browser_locator
+
+
+class ElementCache(object):
+    """Cache of the elements found by locators, for each browser and each
+    document, i.e. each window and frame.
+
+    Each entry is stamped with the document it was found in and its
+    generation, a counter of the mutations of the document kept by the
+    runtime of the library (see `scripts.GENERATION`). A lookup sends the
+    cached elements to the browser, which only returns the current stamp and
+    whether the elements are still in the document: the entry is used when
+    both match, and the locator is resolved again otherwise, or when the
+    driver reports the elements as stale. Up to `size` entries are kept."""
+
+    def __init__(self, size=0):
+
+        self.size = int(size)
+
+        if self.size < 0:
+            raise ValueError("Element cache size should be positive, got "
+                             "'%s'" % self.size)
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(('hits', 'misses', 'stale'), 0)
+
+    @staticmethod
+    def accepts(locator):
+        """Returns whether the elements found by `locator` only depend on the
+        document, so that they can be cached. The `input` strategy depends on
+        the focus, and CSS pseudo-classes such as `:checked` on the state of
+        the elements, neither of which mutates the document."""
+
+        browser_locator = to_browser_locator(locator)
+        if browser_locator is None or browser_locator[0] == 'input':
+            return False
+        return not (browser_locator[0] in ('css', 'first_tag', 'last_tag') and
+                    ':' in browser_locator[1])
+
+    def stats(self):
+        """Returns the number of lookups which used the cache (`hits`), which
+        resolved the locator (`misses`) and, among the latter, the ones whose
+        cached elements were stale, and the number of entries."""
+
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+    def clear(self):
+
+        with self._lock:
+            self._entries.clear()
+
+    def find(self, browser, key, find):
+        """Returns the elements cached for `key` in the current document of
+        `browser`, or the ones returned by `find()`, which are then cached."""
+
+        with self._lock:
+            entry = self._entries.get((browser, key))
+
+        stamp = None
+        try:
+            if entry:
+                stamp, present = runtime.call(browser, 'generation', entry[1])
+                if present and stamp is not None and stamp == entry[0]:
+                    self._count('hits')
+                    return entry[1]
+            else:
+                stamp = runtime.call(browser, 'generation', [])[0]
+        except StaleElementReferenceException:
+            self._count('stale')
+            stamp = runtime.call(browser, 'generation', [])[0]
+        except WebDriverException:
+            # e.g. no document to run scripts in, the lookup is not cached
+            stamp = None
+
+        self._count('misses')
+        # the stamp is taken before the elements are found, a mutation in
+        # between changes the generation and invalidates the entry
+        elements = find()
+        with self._lock:
+            self._entries.pop((browser, key), None)
+            if stamp is not None and elements:
+                self._entries[(browser, key)] = (stamp, elements)
+                while len(self._entries) > self.size:
+                    self._entries.popitem(last=False)
+        return elements
+
+    def _count(self, stat):
+
+        with self._lock:
+            self._stats[stat] += 1
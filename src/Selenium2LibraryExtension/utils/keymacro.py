@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+
+try:
+    string_type = basestring
+except NameError:
+    string_type = str
+
+_MODIFIERS = frozenset((Keys.SHIFT, Keys.CONTROL, Keys.ALT, Keys.META))
+
+_ALIASES = {'CTRL': 'CONTROL', 'ESC': 'ESCAPE', 'CMD': 'COMMAND'}
+
+
+def _to_key(name):
+    if len(name) == 1:
+        return name
+    key = getattr(Keys, _ALIASES.get(name.upper(), name.upper()), None)
+    if not isinstance(key, string_type):
+        raise ValueError("Unknown key '%s'" % name)
+    return key
+
+
+class KeyMacro(object):
+    """A sequence of key chords and texts, compiled once into the payload that
+    plays the whole sequence in a single request to the driver.
+
+    Each step is either:
+    - a text prefixed by `text:`, typed character by character. Modifier keys
+      found in the text are held until the end of the text, or until
+      `Keys.NULL`, like with WebElement.send_keys.
+    - a chord of key names (attribute names of `Keys` such as `CONTROL`, `F1`
+      or `TAB`, or single characters) joined by `+`, for instance
+      `CONTROL+SHIFT+z`. All the keys but the last one are held while the last
+      one is pressed.
+    - a tuple or a list of keys, which is a chord of raw keys."""
+
+    def __init__(self, *steps):
+
+        if not steps:
+            raise ValueError("A key macro needs at least one step")
+
+        self.steps = tuple(steps)
+        parsed = [self._parse(step) for step in steps]
+        self.value = self._compile_value(parsed)
+        self.actions = self._compile_actions(parsed)
+
+    def play(self, driver):
+        """Plays the macro in the active element of `driver`, as W3C actions
+        when both the driver and the Selenium bindings support them."""
+
+        command = getattr(Command, 'W3C_ACTIONS', None)
+        if command and getattr(driver, 'w3c', False):
+            driver.execute(command, self.actions)
+        else:
+            driver.execute(Command.SEND_KEYS_TO_ACTIVE_ELEMENT,
+                           {'value': self.value})
+
+    @staticmethod
+    def _parse(step):
+
+        if not isinstance(step, string_type):
+            return 'chord', list(step)
+
+        if step.startswith('text:'):
+            return 'text', step[len('text:'):]
+
+        if len(step) == 1:
+            return 'chord', [step]
+
+        names = step.split('+')
+        # a chord ending with the plus key
+        if step.endswith('++'):
+            names = names[:-2] + ['+']
+        if '' in names:
+            raise ValueError("Invalid key chord '%s'" % step)
+        return 'chord', [_to_key(name) for name in names]
+
+    @staticmethod
+    def _compile_value(parsed):
+        """Compiles the value of a legacy `sendKeysToActiveElement` command:
+        modifiers stay pressed until they are sent again or until NULL."""
+
+        value = []
+        for kind, keys in parsed:
+            value.extend(keys)
+            if any(key in _MODIFIERS for key in keys) and keys[-1] != Keys.NULL:
+                value.append(Keys.NULL)
+        return value
+
+    @staticmethod
+    def _compile_actions(parsed):
+        """Compiles the payload of a W3C `actions` command."""
+
+        actions = []
+
+        def press(key):
+            actions.append({'type': 'keyDown', 'value': key})
+
+        def release(key):
+            actions.append({'type': 'keyUp', 'value': key})
+
+        for kind, keys in parsed:
+
+            if kind == 'chord':
+                for key in keys:
+                    press(key)
+                for key in reversed(keys):
+                    release(key)
+                continue
+
+            held = []
+            for key in keys:
+                if key == Keys.NULL:
+                    while held:
+                        release(held.pop())
+                elif key in _MODIFIERS:
+                    if key in held:
+                        held.remove(key)
+                        release(key)
+                    else:
+                        held.append(key)
+                        press(key)
+                else:
+                    press(key)
+                    release(key)
+            while held:
+                release(held.pop())
+
+        return {'actions': [{'type': 'key', 'id': 'keyboard',
+                             'actions': actions}]}
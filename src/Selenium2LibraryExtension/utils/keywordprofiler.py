@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+import codecs
+import json
+import os
+import time
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+from robot.utils import html_escape
+from Selenium2LibraryExtension.utils.commandtracer import observe_commands
+
+_COLUMNS = ('keyword', 'calls', 'wall', 'self', 'driver', 'sleep', 'python')
+
+_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Keyword profile</title>
+<style>
+body { font-family: sans-serif; }
+table { border-collapse: collapse; }
+th { cursor: pointer; background: #ddd; }
+th, td { border: 1px solid #aaa; padding: 2px 8px; }
+td.number { text-align: right; }
+</style>
+</head>
+<body>
+<h1>Keyword profile</h1>
+<p>Times are in seconds. <i>self</i> is the time not spent in the child keywords, split into the time waiting
+for the driver, sleeping between the polls of the waits and running Python. Click a column to sort.</p>
+<table>
+<thead><tr>%(header)s</tr></thead>
+<tbody>
+%(rows)s
+</tbody>
+</table>
+<script>
+document.querySelectorAll('th').forEach(function (th, column) {
+    th.addEventListener('click', function () {
+        var body = document.querySelector('tbody'),
+            rows = Array.prototype.slice.call(body.rows),
+            descending = th.dataset.order !== 'desc';
+        rows.sort(function (a, b) {
+            var x = a.cells[column].dataset.value, y = b.cells[column].dataset.value;
+            var order = column ? x - y : x.localeCompare(y);
+            return descending ? -order : order;
+        });
+        th.dataset.order = descending ? 'desc' : 'asc';
+        rows.forEach(function (row) { body.appendChild(row); });
+    });
+});
+</script>
+</body>
+</html>
+"""
+
+
+class KeywordProfiler(object):
+    """Library listener measuring where the time of the keywords goes. For
+    every keyword it measures the wall time and the self time (wall time
+    minus the one of its child keywords), and splits the self time into the
+    time blocked on driver commands, the time sleeping between the polls of
+    the waits and the remaining Python time.
+
+    When the execution ends, the collapsed stacks of the self times (in
+    milliseconds) are written to `output`.folded, for flamegraph.pl and
+    compatible tools, and the totals by keyword to `output`.json and
+    `output`.html. A relative `output` is relative to the output directory of
+    Robot Framework."""
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, output='profile'):
+
+        self.output = output
+        self._root = None
+        self._frames = []
+        self._stacks = {}
+        self._keywords = {}
+
+    def install(self, driver):
+        """Makes the time spent in the commands of `driver` measured."""
+
+        observe_commands(driver, self)
+
+    def command_executed(self, command, seconds, params, response):
+        if self._frames:
+            self._frames[-1]['driver'] += seconds
+
+    def slept(self, seconds):
+        """Records that the running keyword slept for `seconds`."""
+
+        if self._frames:
+            self._frames[-1]['sleep'] += seconds
+
+    def start_suite(self, name, attrs):
+        self._root = attrs['longname']
+
+    def start_test(self, name, attrs):
+        self._root = attrs['longname']
+
+    def end_test(self, name, attrs):
+        self._root = attrs['longname'].rsplit('.', 1)[0]
+
+    def end_suite(self, name, attrs):
+        self._root = attrs['longname'].rsplit('.', 1)[0]
+
+    def start_keyword(self, name, attrs):
+        self._frames.append({'name': name, 'start': time.time(),
+                             'children': 0.0, 'driver': 0.0, 'sleep': 0.0})
+
+    def end_keyword(self, name, attrs):
+
+        frame = self._frames.pop()
+        wall = time.time() - frame['start']
+        own = max(0.0, wall - frame['children'])
+        python = max(0.0, own - frame['driver'] - frame['sleep'])
+        if self._frames:
+            self._frames[-1]['children'] += wall
+
+        stats = self._keywords.setdefault(
+            frame['name'], dict.fromkeys(_COLUMNS[1:], 0))
+        stats['calls'] += 1
+        for column, seconds in (('wall', wall), ('self', own),
+                                ('driver', frame['driver']),
+                                ('sleep', frame['sleep']),
+                                ('python', python)):
+            stats[column] += seconds
+
+        stack = ';'.join([self._root or ''] +
+                         [parent['name'] for parent in self._frames] +
+                         [frame['name']]).replace(' ', '_')
+        for suffix, seconds in (('', python),
+                                (';[driver]', frame['driver']),
+                                (';[sleep]', frame['sleep'])):
+            if seconds:
+                self._stacks[stack + suffix] = \
+                    self._stacks.get(stack + suffix, 0.0) + seconds
+
+    def report(self):
+        """Returns the totals by keyword, by decreasing self time."""
+
+        rows = [dict(stats, keyword=name)
+                for name, stats in self._keywords.items()]
+        return sorted(rows, key=lambda row: -row['self'])
+
+    def close(self):
+
+        output = self.output
+        if not os.path.isabs(output):
+            try:
+                output = os.path.join(
+                    BuiltIn().get_variable_value('${OUTPUT DIR}'), output)
+            except RobotNotRunningError:
+                pass
+
+        report = self.report()
+
+        with codecs.open(output + '.folded', 'w', 'utf-8') as folded:
+            for stack, seconds in sorted(self._stacks.items()):
+                milliseconds = int(round(seconds * 1000))
+                if milliseconds:
+                    folded.write(u'%s %d\n' % (stack, milliseconds))
+
+        with codecs.open(output + '.json', 'w', 'utf-8') as profile:
+            json.dump(report, profile, indent=2, sort_keys=True)
+
+        with codecs.open(output + '.html', 'w', 'utf-8') as profile:
+            profile.write(_HTML % {
+                'header': ''.join('<th>%s</th>' % column
+                                  for column in _COLUMNS),
+                'rows': '\n'.join(self._html_row(row) for row in report)})
+
+        logger.info("Keyword profile written to %s.folded, .json and .html" %
+                    output, also_console=True)
+
+    def _html_row(self, row):
+
+        name = html_escape(row['keyword'])
+        # html_escape leaves the quotes, which would end the attribute
+        cells = ['<td data-value="%s">%s</td>' %
+                 (name.replace('"', '&quot;'), name)]
+        cells.extend('<td class="number" data-value="%s">%s</td>' %
+                     (row[column], row[column] if column == 'calls' else
+                      '%.3f' % row[column])
+                     for column in _COLUMNS[1:])
+        return '<tr>%s</tr>' % ''.join(cells)
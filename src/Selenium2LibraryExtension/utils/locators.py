@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+try:
+    string_type = basestring
+except NameError:
+    string_type = str
+
+# Selenium2Library strategies, and the ones added by Selenium2LibraryExtension,
+# that the in-browser scripts know how to resolve
+_BROWSER_STRATEGIES = ('id', 'name', 'identifier', 'xpath', 'css', 'tag',
+                       'input', 'meta_name', 'first_tag', 'last_tag')
+
+
+def to_browser_locator(locator):
+    """Translates a Selenium2Library `locator` into the `[strategy, criteria]`
+    pair understood by the in-browser scripts (see `scripts.FIND_ELEMENTS`).
+
+    Returns None when the locator can only be resolved from Python, which
+    is the case for WebElements, custom strategies and strategies such as
+    `link` or `dom` whose in-browser evaluation would differ from the one
+    of the driver."""
+
+    if not isinstance(locator, string_type):
+        return None
+
+    if locator.startswith('//'):
+        return ['xpath', locator]
+
+    prefix, separator, criteria = locator.partition('=')
+    if not separator:
+        return ['default', locator]
+
+    # same normalization as the NormalizedDict of the ElementFinder
+    prefix = prefix.lower().replace(' ', '')
+    criteria = criteria.strip()
+
+    if prefix == 'default':
+        if criteria.startswith('//'):
+            return ['xpath', criteria]
+        return ['default', criteria]
+
+    if prefix in _BROWSER_STRATEGIES:
+        return [prefix, criteria]
+
+    return None
+
+
+def to_browser_locators(locators):
+    """Translates all of the `locators`, returns None if any of them can't
+    be resolved in the browser."""
+
+    browser_locators = [to_browser_locator(locator) for locator in locators]
+    if None in browser_locators:
+        return None
+    return browser_locators
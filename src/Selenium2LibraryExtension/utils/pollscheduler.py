@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import random
+import robot
+
+
+class PollScheduler(object):
+    """Computes how long a wait loop should sleep between two polls.
+
+    The first `fast_polls` polls are spaced by `interval`, the following ones
+    grow exponentially by `backoff` until they reach `max_interval`. Every
+    delay is randomized by +/- `jitter` (a fraction of the delay) and is never
+    longer than the time remaining before the deadline, so the last poll
+    happens right when the wait expires."""
+
+    def __init__(self,
+                 interval=0.05,
+                 max_interval=1.0,
+                 backoff=1.5,
+                 jitter=0.1,
+                 fast_polls=3):
+
+        self.interval = robot.utils.timestr_to_secs(interval)
+        self.max_interval = robot.utils.timestr_to_secs(max_interval)
+        self.backoff = float(backoff)
+        self.jitter = float(jitter)
+        self.fast_polls = int(fast_polls)
+
+        if self.interval < 0 or self.max_interval < self.interval:
+            raise ValueError(
+                "Poll interval should be positive and not greater than the "
+                "maximum interval, got '%s' and '%s'" %
+                (self.interval, self.max_interval))
+        if self.backoff < 1:
+            raise ValueError("Poll backoff should be at least 1, got '%s'" %
+                             self.backoff)
+        if not 0 <= self.jitter < 1:
+            raise ValueError("Poll jitter should be between 0 and 1, got '%s'"
+                             % self.jitter)
+
+    def delay(self, attempt, remaining):
+        """Returns the number of seconds to sleep after the poll number
+        `attempt` (starting at 0) when `remaining` seconds are left before
+        the deadline of the wait."""
+
+        steps = attempt - self.fast_polls + 1
+        if steps <= 0:
+            delay = self.interval
+        else:
+            delay = min(self.interval * self.backoff ** min(steps, 64),
+                        self.max_interval)
+
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+
+        return max(0.0, min(delay, remaining))
+
+    def __str__(self):
+        return "interval=%s, max_interval=%s, backoff=%s, jitter=%s" % (
+            robot.utils.secs_to_timestr(self.interval),
+            robot.utils.secs_to_timestr(self.max_interval), self.backoff,
+            self.jitter)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from Selenium2LibraryExtension.utils import scripts
+
+
+def call(driver, name, *args):
+    """Returns the result of the function `name` of the in-page runtime (see
+    `scripts.RUNTIME`) called with `args` in the current document of
+    `driver`. The call only sends the name and the arguments, the runtime is
+    sent along with them when it isn't installed in the document yet."""
+
+    result = driver.execute_script(scripts.RUNTIME_CALL, name, list(args))
+    if result == scripts.RUNTIME_MISSING:
+        result = driver.execute_script(scripts.RUNTIME + scripts.RUNTIME_CALL,
+                                       name, list(args))
+    return result
+
+
+def call_async(driver, name, *args):
+    """Same as `call` for the asynchronous functions of the runtime."""
+
+    result = driver.execute_async_script(scripts.RUNTIME_CALL_ASYNC, name,
+                                         list(args))
+    if result == scripts.RUNTIME_MISSING:
+        result = driver.execute_async_script(
+            scripts.RUNTIME + scripts.RUNTIME_CALL_ASYNC, name, list(args))
+    return result
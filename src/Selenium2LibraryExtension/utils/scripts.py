@@ -0,0 +1,591 @@
+# -*- coding: utf-8 -*-
+
+"""JavaScript sources executed in the browser by the library keywords.
+
+Locators are passed to these scripts as the `[strategy, criteria]` pairs
+returned by `locators.to_browser_locator`.
+
+The scripts are not sent as is: they are the functions of the RUNTIME,
+installed once per document and called by name with `runtime.call`."""
+
+import hashlib
+
+# Defines `find(locator)`, which returns the array of elements matching a
+# locator, in the same order as the driver would return them.
+FIND_ELEMENTS = r"""
+function find(locator) {
+    var strategy = locator[0], criteria = locator[1];
+    function toArray(nodes) {
+        return Array.prototype.slice.call(nodes);
+    }
+    function quote(value) {
+        return '"' + value.replace(/\\/g, '\\\\').replace(/"/g, '\\"') + '"';
+    }
+    function byAttributes(names) {
+        return toArray(document.querySelectorAll(names.map(function (name) {
+            return '[' + name + '=' + quote(criteria) + ']';
+        }).join(',')));
+    }
+    function byXpath() {
+        var result = document.evaluate(criteria, document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), nodes = [];
+        for (var i = 0; i < result.snapshotLength; i++) {
+            nodes.push(result.snapshotItem(i));
+        }
+        return nodes;
+    }
+    switch (strategy) {
+        case 'id': return byAttributes(['id']);
+        case 'name': return byAttributes(['name']);
+        case 'identifier': return byAttributes(['id']).concat(byAttributes(['name']));
+        case 'default': return byAttributes(['id', 'name']);
+        case 'xpath': return byXpath();
+        case 'css': return toArray(document.querySelectorAll(criteria));
+        case 'tag': return toArray(document.getElementsByTagName(criteria));
+        case 'input': return [document.activeElement];
+        case 'meta_name':
+            return toArray(document.getElementsByTagName('meta')).filter(function (meta) {
+                return meta.getAttribute('name') === criteria;
+            });
+        case 'first_tag':
+            var first = document.querySelector(criteria);
+            return first ? [first] : [];
+        case 'last_tag':
+            var all = document.querySelectorAll(criteria);
+            return all.length ? [all[all.length - 1]] : [];
+    }
+    throw new Error('Unsupported locator strategy ' + strategy);
+}
+"""
+
+# Argument is a locator, returns the elements matching it.
+FIND_BY_LOCATOR = FIND_ELEMENTS + r"""
+return find(arguments[0]);
+"""
+
+# Defines `attribute(element, name)`, which mimics WebElement.get_attribute:
+# properties win over attributes and boolean properties are 'true' or null.
+GET_ATTRIBUTE = r"""
+function attribute(element, name) {
+    var value = element[name];
+    if (name in element && value !== null && typeof value !== 'object' &&
+            typeof value !== 'function') {
+        if (typeof value === 'boolean') {
+            return value ? 'true' : null;
+        }
+        return String(value);
+    }
+    return element.getAttribute(name);
+}
+"""
+
+# Defines `setValue(element, value)`, which sets the value of a field through
+# the native setter, so that frameworks wrapping the value property notice
+# the change, then dispatches the input and change events.
+SET_VALUE = r"""
+function setValue(element, value) {
+    var descriptor = Object.getOwnPropertyDescriptor(
+        Object.getPrototypeOf(element), 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(element, value);
+    } else {
+        element.value = value;
+    }
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+"""
+
+# Defines the `conditions` the wait keywords can wait for. Each condition
+# takes the locators and the arguments of the wait, and mirrors the Python
+# check used when waiting from Python.
+CONDITIONS = r"""
+var conditions = {
+    present: function (locators) {
+        return locators.every(function (locator) { return find(locator).length > 0; });
+    },
+    any_present: function (locators) {
+        return locators.some(function (locator) { return find(locator).length > 0; });
+    },
+    absent: function (locators) {
+        return locators.every(function (locator) { return find(locator).length === 0; });
+    },
+    focus: function (locators, args) {
+        var element = find(locators[0])[0];
+        return !!element && (element === document.activeElement) === args[0];
+    },
+    attribute: function (locators, args) {
+        var element = find(locators[0])[0];
+        if (!element) {
+            return false;
+        }
+        var value = attribute(element, args[2]);
+        value = value === null ? 'None' : String(value);
+        if (args[3]) {
+            value = value.trim();
+        }
+        return args[0] ? value.indexOf(args[1]) !== -1 : value === args[1];
+    },
+    has_class: function (locators, args) {
+        var element = find(locators[0])[0];
+        if (!element) {
+            return false;
+        }
+        return args[0].every(function (name) {
+            return element.classList.contains(name) === args[1];
+        });
+    }
+};
+"""
+
+# Arguments are a list of locators or WebElements and a list of CSS property
+# names. Returns, for each of them, the snapshot of the state of the first
+# matching element, or null when there is none. Colors are in the same
+# format as the ones returned by WebElement.value_of_css_property.
+ELEMENT_SNAPSHOTS = FIND_ELEMENTS + GET_ATTRIBUTE + r"""
+var styles = arguments[1];
+// same color properties as the ones WebDriver standardizes
+var colors = ['background-color', 'border-top-color', 'border-right-color',
+              'border-bottom-color', 'border-left-color', 'color', 'outline-color'];
+function rgba(name, value) {
+    var rgb = /^rgb\((\d+), (\d+), (\d+)\)$/.exec(value);
+    if (!rgb || colors.indexOf(name) === -1) {
+        return value;
+    }
+    return 'rgba(' + rgb.slice(1).join(', ') + ', 1)';
+}
+function snapshot(element) {
+    if (!element) {
+        return null;
+    }
+    var computed = window.getComputedStyle(element),
+        rect = element.getBoundingClientRect(), css = {};
+    styles.forEach(function (name) {
+        css[name] = rgba(name, computed.getPropertyValue(name));
+    });
+    return {
+        value: attribute(element, 'value'),
+        text: (element.innerText === undefined ? element.textContent
+                                               : element.innerText).trim(),
+        classes: (element.getAttribute('class') || '').split(/\s+/).filter(Boolean),
+        styles: css,
+        rect: {x: rect.left, y: rect.top, width: rect.width, height: rect.height},
+        size: {
+            width: element.offsetWidth === undefined ? Math.round(rect.width) : element.offsetWidth,
+            height: element.offsetHeight === undefined ? Math.round(rect.height) : element.offsetHeight
+        },
+        focused: element === document.activeElement,
+        visible: rect.width > 0 && rect.height > 0 &&
+                 computed.visibility !== 'hidden' && computed.display !== 'none'
+    };
+}
+return arguments[0].map(function (locator) {
+    return snapshot(Array.isArray(locator) ? find(locator)[0] : locator);
+});
+"""
+
+# Argument is a locator or a WebElement. Clears the field by selecting and
+# deleting its content like a user would, or by setting its value when the
+# browser can't delete it. Returns whether the field is editable and its
+# value after clearing, or null when the element isn't found.
+CLEAR_FIELD = FIND_ELEMENTS + SET_VALUE + r"""
+var element = Array.isArray(arguments[0]) ? find(arguments[0])[0] : arguments[0];
+if (!element) {
+    return null;
+}
+if (element.readOnly || element.disabled) {
+    return [false, element.value];
+}
+element.focus();
+if (typeof element.select === 'function') {
+    element.select();
+    document.execCommand('delete');
+}
+if (element.value !== '') {
+    setValue(element, '');
+}
+return [true, element.value];
+"""
+
+# Arguments are a list of locators or WebElements and a list of class names.
+# Returns, for each of them, the classes of the first matching element and
+# whether it has each of the class names, or null when there is none.
+ELEMENT_CLASSES = FIND_ELEMENTS + r"""
+var names = arguments[1];
+return arguments[0].map(function (locator) {
+    var element = Array.isArray(locator) ? find(locator)[0] : locator;
+    if (!element) {
+        return null;
+    }
+    return [Array.prototype.slice.call(element.classList), names.map(function (name) {
+        return element.classList.contains(name);
+    })];
+});
+"""
+
+# Arguments are a locator or a WebElement, and whether to wait for the next
+# animation frame. Returns an array of the first matching element and the
+# reasons why it can't be clicked yet (empty when it can be), or null when the
+# element isn't found. An array, as the element isn't unwrapped from objects by
+# Selenium 2. The element can be clicked when it is visible, enabled, on top at
+# its centre and, when waiting, at the same place on the next animation frame:
+# the script is then asynchronous and calls back with the result instead,
+# within 100 ms.
+CLICKABILITY = FIND_ELEMENTS + r"""
+var element = Array.isArray(arguments[0]) ? find(arguments[0])[0] : arguments[0],
+    settle = arguments[1], callback = settle ? arguments[2] : function (result) {
+        return result;
+    };
+function describe(node) {
+    return '<' + node.tagName.toLowerCase() + (node.id ? ' id="' + node.id + '"' : '') + '>';
+}
+function center(rect) {
+    return [rect.left + rect.width / 2, rect.top + rect.height / 2];
+}
+function probe() {
+    var rect = element.getBoundingClientRect(), style = window.getComputedStyle(element);
+    if (!(rect.width > 0 && rect.height > 0) || style.visibility === 'hidden' ||
+            style.display === 'none') {
+        return callback([element, ['not visible']]);
+    }
+    var problems = [];
+    if (element.disabled) {
+        problems.push('disabled');
+    }
+    var point = center(rect);
+    if (point[0] < 0 || point[1] < 0 || point[0] >= window.innerWidth ||
+            point[1] >= window.innerHeight) {
+        // the driver scrolls the element into view before clicking it too
+        element.scrollIntoView({block: 'center', inline: 'center'});
+        rect = element.getBoundingClientRect();
+        point = center(rect);
+    }
+    var hit = document.elementFromPoint(point[0], point[1]);
+    if (!hit) {
+        problems.push('outside of the viewport');
+    } else if (hit !== element && !element.contains(hit)) {
+        problems.push('covered by ' + describe(hit));
+    }
+    if (!settle) {
+        return callback([element, problems]);
+    }
+    var done = false;
+    function compare() {
+        if (done) {
+            return;
+        }
+        done = true;
+        var now = element.getBoundingClientRect();
+        if (now.left !== rect.left || now.top !== rect.top ||
+                now.width !== rect.width || now.height !== rect.height) {
+            problems.push('moving');
+        }
+        callback([element, problems]);
+    }
+    if (window.requestAnimationFrame) {
+        window.requestAnimationFrame(compare);
+    }
+    // animation frames are not run in background windows
+    setTimeout(compare, 100);
+}
+return element ? probe() : callback(null);
+"""
+
+# Arguments are a locator or a WebElement and a text. Replaces the value of
+# the field with the text as if it had been typed, firing the input, keyup
+# and change events, and leaves the caret at the end of the text. Returns the
+# field and whether it is editable, or null when it isn't found.
+BULK_INPUT = FIND_ELEMENTS + SET_VALUE + r"""
+var element = Array.isArray(arguments[0]) ? find(arguments[0])[0] : arguments[0];
+if (!element) {
+    return null;
+}
+if (element.readOnly || element.disabled) {
+    return [element, false];
+}
+element.focus();
+setValue(element, arguments[1]);
+element.dispatchEvent(new KeyboardEvent('keyup', {bubbles: true}));
+try {
+    element.setSelectionRange(element.value.length, element.value.length);
+} catch (e) {
+    // some types of input have no selection
+}
+return [element, true];
+"""
+
+# Arguments are a locator or a WebElement of a list, the text of an option,
+# how to match it ('exact', 'normalized' or 'partial') and whether to select
+# the option. Returns an array holding the first matching option, an empty
+# array when no option matches, or null when the list isn't found.
+FIND_OPTION_BY_TEXT = FIND_ELEMENTS + r"""
+var list = Array.isArray(arguments[0]) ? find(arguments[0])[0] : arguments[0],
+    text = arguments[1], match = arguments[2], select = arguments[3];
+if (!list) {
+    return null;
+}
+function normalize(value) {
+    return value.replace(/\s+/g, ' ').trim();
+}
+var matches = {
+    exact: function (option) { return option.text === text; },
+    normalized: function (option) { return normalize(option.text) === normalize(text); },
+    partial: function (option) { return option.text.indexOf(text) !== -1; }
+}[match];
+var options = list.getElementsByTagName('option');
+for (var i = 0; i < options.length; i++) {
+    if (matches(options[i])) {
+        if (select && !options[i].selected) {
+            options[i].selected = true;
+            list.dispatchEvent(new Event('input', {bubbles: true}));
+            list.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+        return [options[i]];
+    }
+}
+return [];
+"""
+
+# Arguments are a locator and a token. Remembers the elements currently
+# matching the locator under the token, without keeping them alive, and
+# returns their number.
+MARK_ELEMENTS = FIND_ELEMENTS + r"""
+var elements = find(arguments[0]);
+window.__s2leMarks = window.__s2leMarks || {};
+window.__s2leMarks[arguments[1]] = typeof WeakSet === 'undefined' ? elements
+                                                                  : new WeakSet(elements);
+return elements.length;
+"""
+
+# Arguments are a locator, a token given to MARK_ELEMENTS and whether to
+# forget the token. Returns the elements matching the locator that weren't
+# marked under the token. The token is also forgotten once such elements are
+# found.
+FIND_UNMARKED = FIND_ELEMENTS + r"""
+var marks = window.__s2leMarks || {}, marked = marks[arguments[1]];
+var unmarked = find(arguments[0]).filter(function (element) {
+    if (!marked) {
+        return true;
+    }
+    return marked.has ? !marked.has(element) : marked.indexOf(element) === -1;
+});
+if (unmarked.length || arguments[2]) {
+    delete marks[arguments[1]];
+}
+return unmarked;
+"""
+
+# Arguments are locators, returns for each of them whether it matches at
+# least one element.
+FIND_PRESENCE = FIND_ELEMENTS + r"""
+return arguments[0].map(function (locator) {
+    return find(locator).length > 0;
+});
+"""
+
+# Arguments are a locator and a limit (0 for none), returns the number of
+# elements matching the locator, up to the limit. XPath results are counted
+# without building the list of the matching nodes.
+COUNT_ELEMENTS = FIND_ELEMENTS + r"""
+var locator = arguments[0], limit = arguments[1], count = 0;
+if (locator[0] === 'xpath' && !limit) {
+    return document.evaluate('count(' + locator[1] + ')', document, null,
+        XPathResult.NUMBER_TYPE, null).numberValue;
+}
+if (locator[0] === 'xpath') {
+    var result = document.evaluate(locator[1], document, null,
+        XPathResult.UNORDERED_NODE_ITERATOR_TYPE, null);
+    while (count < limit && result.iterateNext()) {
+        count++;
+    }
+    return count;
+}
+count = find(locator).length;
+return limit ? Math.min(count, limit) : count;
+"""
+
+# Argument is a locator or a WebElement, returns whether the element is the
+# active element of the document, or null when it isn't found.
+ELEMENT_FOCUS = FIND_ELEMENTS + r"""
+var element = Array.isArray(arguments[0]) ? find(arguments[0])[0] : arguments[0];
+return element ? element === document.activeElement : null;
+"""
+
+# Asynchronous script: arguments are the locators, the name of the condition,
+# its arguments and the number of seconds to wait. Calls back with true as
+# soon as the condition is met, false when the time is up and null when the
+# browser can't observe the page (the caller should then poll from Python).
+WAIT_FOR_CONDITION = FIND_ELEMENTS + GET_ATTRIBUTE + CONDITIONS + r"""
+var locators = arguments[0], condition = conditions[arguments[1]],
+    args = arguments[2], timeout = arguments[3] * 1000,
+    callback = arguments[arguments.length - 1];
+// changes of value and focus don't trigger any mutation
+var events = ['input', 'change', 'focusin', 'focusout'];
+// the mutations that can change the result of the condition
+var observed = {
+    has_class: {childList: true, subtree: true, attributes: true,
+                attributeFilter: ['class']}
+}[arguments[1]] || {childList: true, subtree: true, attributes: true,
+                    characterData: true};
+function check() {
+    try {
+        return condition(locators, args);
+    } catch (e) {
+        return false;
+    }
+}
+if (check()) {
+    callback(true);
+} else if (typeof MutationObserver === 'undefined') {
+    callback(null);
+} else {
+    var done = false, observer, backstop, deadline;
+    var finish = function (result) {
+        if (done) {
+            return;
+        }
+        done = true;
+        observer.disconnect();
+        clearInterval(backstop);
+        clearTimeout(deadline);
+        events.forEach(function (name) {
+            document.removeEventListener(name, recheck, true);
+        });
+        callback(result);
+    };
+    var recheck = function (event) {
+        if (event && event.type === 'focusout') {
+            // the focus only moves to the next element after focusout
+            setTimeout(recheck, 0);
+        } else if (check()) {
+            finish(true);
+        }
+    };
+    observer = new MutationObserver(recheck);
+    observer.observe(document, observed);
+    events.forEach(function (name) {
+        document.addEventListener(name, recheck, true);
+    });
+    // property changes made by scripts don't trigger any mutation or event
+    backstop = setInterval(recheck, 250);
+    deadline = setTimeout(function () { finish(check()); }, timeout);
+}
+"""
+
+# Argument is an element, removes the focus from it.
+BLUR = r"""
+arguments[0].blur();
+"""
+
+# Defines `documentGeneration()`, which returns the stamp of the document: an
+# id which differs between documents and the number of times the document was
+# seen mutating, or null when its mutations can't be observed. The document is
+# only observed from the first call on, which keeps the state in its window.
+DOCUMENT_GENERATION = r"""
+function documentGeneration() {
+    var state = window.__s2leGeneration;
+    if (!state) {
+        if (typeof MutationObserver === 'undefined') {
+            return null;
+        }
+        state = window.__s2leGeneration = {
+            id: Math.random().toString(36).slice(2) + Date.now().toString(36),
+            count: 0
+        };
+        new MutationObserver(function () {
+            state.count++;
+        }).observe(document, {childList: true, subtree: true, attributes: true,
+                              characterData: true});
+    }
+    return state.id + ':' + state.count;
+}
+"""
+
+# Argument is a list of elements, returns the stamp of the document, which
+# changes with every mutation of the document and differs between documents
+# (null when it can't be known), and whether all of the elements are still in
+# the document.
+GENERATION = DOCUMENT_GENERATION + r"""
+return [documentGeneration(), arguments[0].every(function (element) {
+    return document.documentElement.contains(element);
+})];
+"""
+
+# The helpers the scripts above start with, in the order they are
+# concatenated.
+_HELPERS = (FIND_ELEMENTS, GET_ATTRIBUTE, SET_VALUE, CONDITIONS)
+
+# Functions of the runtime, by name, and the script each of them runs.
+_FUNCTIONS = (
+    ('findByLocator', FIND_BY_LOCATOR),
+    ('findPresence', FIND_PRESENCE),
+    ('countElements', COUNT_ELEMENTS),
+    ('elementFocus', ELEMENT_FOCUS),
+    ('elementClasses', ELEMENT_CLASSES),
+    ('elementSnapshots', ELEMENT_SNAPSHOTS),
+    ('clearField', CLEAR_FIELD),
+    ('bulkInput', BULK_INPUT),
+    ('findOptionByText', FIND_OPTION_BY_TEXT),
+    ('markElements', MARK_ELEMENTS),
+    ('findUnmarked', FIND_UNMARKED),
+    ('clickability', CLICKABILITY),
+    ('waitForCondition', WAIT_FOR_CONDITION),
+    ('blur', BLUR),
+    ('generation', GENERATION),
+)
+
+
+def _without_helpers(script):
+    for helper in _HELPERS:
+        if script.startswith(helper):
+            script = script[len(helper):]
+    return script
+
+
+_RUNTIME_BODY = ''.join(_HELPERS) + r"""
+return {
+%s
+};
+""".replace('%s', ',\n'.join('%s: function () {%s}' %
+                              (name, _without_helpers(script))
+                              for name, script in _FUNCTIONS))
+
+# Version of the runtime, which changes with its source, so that a page keeps
+# no runtime of another version of the library.
+RUNTIME_VERSION = hashlib.sha1(_RUNTIME_BODY.encode('utf-8')).hexdigest()[:12]
+
+# Installs the runtime in the current document as `window.__s2le`: the
+# helpers above, defined once, and the functions of `_FUNCTIONS`. Each
+# function takes the arguments of its script, plus the callback for the
+# asynchronous ones.
+RUNTIME = r"""
+window.__s2le = (function () {
+%s
+})();
+window.__s2le.version = '%s';
+""" % (_RUNTIME_BODY, RUNTIME_VERSION)
+
+# Returned by the calls when the runtime isn't installed in the document.
+RUNTIME_MISSING = '__s2le:missing'
+
+# Arguments are the name of a function of the runtime and the list of its
+# arguments. Returns the result of the function, or RUNTIME_MISSING when the
+# runtime isn't installed, e.g. after a navigation.
+RUNTIME_CALL = r"""
+var runtime = window.__s2le;
+if (!runtime || runtime.version !== '%s') {
+    return '%s';
+}
+return runtime[arguments[0]].apply(null, arguments[1]);
+""" % (RUNTIME_VERSION, RUNTIME_MISSING)
+
+# Asynchronous version of RUNTIME_CALL, for the asynchronous functions: the
+# callback is given to the function after its arguments.
+RUNTIME_CALL_ASYNC = r"""
+var runtime = window.__s2le, callback = arguments[arguments.length - 1];
+if (!runtime || runtime.version !== '%s') {
+    callback('%s');
+} else {
+    runtime[arguments[0]].apply(null, arguments[1].concat([callback]));
+}
+""" % (RUNTIME_VERSION, RUNTIME_MISSING)
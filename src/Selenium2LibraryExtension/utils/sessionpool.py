@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+import atexit
+import threading
+from robot.api import logger
+from Selenium2Library.utils import BrowserCache
+
+# Run on the page being left, the storage of the other origins is kept
+_CLEAR_STORAGE = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class SessionPool(object):
+    """Keeps up to `size` browser sessions running for each set of arguments
+    used to create them, so that opening a browser leases an idle session
+    instead of launching a new one.
+
+    Released sessions are reset (extra windows closed, cookies and storage of
+    the current page cleared, blank page loaded) before being leased again,
+    and quit after `max_uses` leases or when they don't respond anymore. When
+    `size` is 0 the pool keeps nothing: sessions are quit on release."""
+
+    def __init__(self, size=0, max_uses=50):
+
+        self.size = int(size)
+        self.max_uses = int(max_uses)
+
+        if self.size < 0 or self.max_uses < 1:
+            raise ValueError(
+                "Session pool size should be positive and the maximum uses "
+                "at least 1, got '%s' and '%s'" % (self.size, self.max_uses))
+
+        self._idle = {}
+        self._uses = {}
+        self._leased = {}
+        self._launching = {}
+        self._lock = threading.Lock()
+        self._launchers = []
+        atexit.register(self.close_all)
+
+    @staticmethod
+    def key(*arguments):
+        """Returns the key of the sessions created with `arguments`."""
+
+        return repr([sorted(argument.items())
+                     if isinstance(argument, dict) else argument
+                     for argument in arguments])
+
+    def lease(self, key, factory):
+        """Returns an idle session created with `key`, or a new one made by
+        calling `factory`. Then launches sessions in the background until
+        there are `size` sessions for the key."""
+
+        browser = None
+        while browser is None:
+            with self._lock:
+                idle = self._idle.get(key)
+                candidate = idle.pop() if idle else None
+            if candidate is None:
+                browser = factory()
+                with self._lock:
+                    self._uses[browser] = 0
+            elif self._healthy(candidate):
+                browser = candidate
+            else:
+                self._quit(candidate)
+
+        with self._lock:
+            self._uses[browser] += 1
+            self._leased[browser] = key
+
+        self._prelaunch(key, factory)
+        return browser
+
+    def release(self, browser):
+        """Takes back a session, which is kept for another lease when it was
+        leased by the pool, can still be used and there is room for it."""
+
+        with self._lock:
+            key = self._leased.pop(browser, None)
+            uses = self._uses.get(browser, 0)
+            full = self._count(key) >= self.size
+
+        if key is None or full or uses >= self.max_uses or \
+                not self._reset(browser):
+            self._quit(browser)
+            return
+
+        with self._lock:
+            self._idle.setdefault(key, []).append(browser)
+
+    def close_all(self):
+        """Quits all of the idle sessions, waiting for the ones being launched."""
+
+        for launcher in list(self._launchers):
+            launcher.join(60)
+
+        with self._lock:
+            browsers = [browser for idle in self._idle.values()
+                        for browser in idle]
+            self._idle.clear()
+
+        for browser in browsers:
+            self._quit(browser)
+
+    def _prelaunch(self, key, factory):
+
+        with self._lock:
+            missing = self.size - self._count(key)
+            if missing <= 0:
+                return
+            self._launching[key] = self._launching.get(key, 0) + missing
+
+        for _ in range(missing):
+            launcher = threading.Thread(target=self._launch,
+                                        args=(key, factory))
+            launcher.daemon = True
+            self._launchers.append(launcher)
+            launcher.start()
+
+    def _count(self, key):
+        """Number of sessions leased, idle or being launched for `key`."""
+
+        return len(self._idle.get(key, [])) + self._launching.get(key, 0) + \
+            sum(1 for leased in self._leased.values() if leased == key)
+
+    def _launch(self, key, factory):
+
+        try:
+            browser = factory()
+        except Exception as e:
+            browser = None
+            logger.debug("Couldn't launch a session for the pool: %s" % e)
+
+        with self._lock:
+            self._launching[key] -= 1
+            self._launchers.remove(threading.current_thread())
+            if browser is not None:
+                self._uses[browser] = 0
+                self._idle.setdefault(key, []).append(browser)
+
+    def _reset(self, browser):
+
+        try:
+            handles = browser.window_handles
+            for handle in handles[1:]:
+                browser.switch_to.window(handle)
+                browser.close()
+            browser.switch_to.window(handles[0])
+            browser.execute_script(_CLEAR_STORAGE)
+            browser.delete_all_cookies()
+            browser.get('about:blank')
+            return True
+        except Exception as e:
+            logger.debug("Couldn't reset session %s: %s" %
+                         (browser.session_id, e))
+            return False
+
+    def _healthy(self, browser):
+
+        try:
+            browser.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, browser):
+
+        with self._lock:
+            self._uses.pop(browser, None)
+        try:
+            browser.quit()
+        except Exception:
+            pass
+
+
+class PooledBrowserCache(BrowserCache):
+    """BrowserCache which gives the browsers back to a `SessionPool` instead
+    of quitting them when they are closed. The `installers`, such as a
+    `ConnectionPool`, are installed in the browsers registered in it."""
+
+    def __init__(self, pool, installers=()):
+
+        BrowserCache.__init__(self)
+        self.pool = pool
+        self.installers = list(installers)
+
+    def register(self, browser, alias=None):
+        for installer in self.installers:
+            installer.install(browser)
+        self._closed.discard(browser)
+        if browser in self._connections:
+            # a session leased again by the pool is opened again at its
+            # former index, instead of being registered twice
+            self.current = browser
+            index = self._connections.index(browser) + 1
+            if alias:
+                self._aliases[alias] = index
+            return index
+        return BrowserCache.register(self, browser, alias)
+
+    def close(self):
+        if self.current:
+            browser = self.current
+            self.pool.release(browser)
+            self.current = self._no_current
+            self._closed.add(browser)
+
+    def close_all(self):
+        for browser in self._connections:
+            if browser not in self._closed:
+                self.pool.release(browser)
+        self.empty_cache()
+        self._closed.clear()
+        return self.current
@@ -0,0 +1,158 @@
+"""Benchmark cases: the arguments each keyword of `_keywords` is run with, on
+the page built by `build_page`."""
+
+from selenium.webdriver.common.keys import Keys
+
+
+class Case(object):
+    """Runs `keyword` with `args` on a fresh page, after `setup(library, page)`
+    when given. Cases with a `skip` reason are reported but not run."""
+
+    def __init__(self, keyword, *args, **options):
+
+        self.keyword = keyword
+        self.args = args
+        self.name = options.get('name', keyword)
+        self.setup = options.get('setup')
+        self.skip = options.get('skip')
+
+
+def build_page(page):
+    """Adds the elements the cases use to `page`."""
+
+    body = page.add('body')
+    form = page.add('form', parent=body, id='form')
+    page.add('input', parent=form, id='first_name', name='first_name',
+             value='John', classes='field required')
+    page.add('input', parent=form, id='last_name', name='last_name',
+             value='Doe ', classes='field')
+    page.add('input', parent=form, id='readonly', value='Fixed',
+             enabled=False)
+    page.add('input', parent=form, id='checkbox', type='checkbox')
+    country = page.add('select', parent=form, id='country')
+    for name in ('Canada', 'France', 'Japan'):
+        page.add('option', parent=country, text=name, value=name)
+    page.add('button', parent=form, id='submit', text='Submit',
+             classes='enabled')
+    page.add('p', parent=body, id='paragraph', text='Hello', size=(200, 30),
+             styles={'color': 'rgba(0, 0, 0, 1)',
+                     'background-color': 'rgba(255, 255, 255, 1)'})
+    items = page.add('ul', parent=body, id='list')
+    for index in range(20):
+        page.add('li', parent=items, text='Item %d' % index, classes='item')
+    page.title = 'Benchmark'
+    page.url = 'http://benchmark/'
+
+
+def _focus(locator):
+    def setup(library, page):
+        page.active = page.find('id', locator.split('=', 1)[1])[0]
+    return setup
+
+
+def _define_macro(library, page):
+    library.define_key_macro('select all and type', 'CTRL+a', 'text:Jane')
+    _focus('id=first_name')(library, page)
+
+
+def _check(library, page):
+    page.find('id', 'checkbox')[0].selected = True
+
+
+def _appear_later(library, page):
+    page.later(0.05, lambda: page.add('div', id='spinner'))
+
+
+def _come_and_go(library, page):
+    spinner = []
+    page.later(0.02, lambda: spinner.append(page.add('div', id='spinner')))
+    page.later(0.2, lambda: page.remove(spinner[0]))
+
+
+def _add_class_later(library, page):
+    page.later(0.05, lambda: page.find('id', 'paragraph')[0]
+               .classes.append('highlighted'))
+
+
+CASES = [
+    Case('wait_until_element_has_focus', 'id=first_name',
+         setup=_focus('id=first_name')),
+    Case('wait_until_element_does_not_have_focus', 'id=first_name'),
+    Case('wait_until_element_attribute_is', 'id=first_name', 'John'),
+    Case('wait_until_element_attribute_contains', 'id=first_name', 'Jo'),
+    Case('set_element_focus', 'id=first_name'),
+    Case('clear_input_field', 'id=first_name'),
+    Case('clear_input_field', 'id=first_name', 2,
+         name='clear_input_field (backspace)'),
+    Case('clear_input_field', 'id=first_name', 3,
+         name='clear_input_field (in browser)'),
+    Case('input_text_in_bulk', 'id=first_name', 'x' * 5000, 3),
+    Case('element_text_color_should_be', 'id=paragraph',
+         'rgba(0, 0, 0, 1)'),
+    Case('element_background_color_should_be', 'id=paragraph',
+         'rgba(255, 255, 255, 1)'),
+    Case('element_width_should_be', 'id=paragraph', '200'),
+    Case('element_height_should_be', 'id=paragraph', '30'),
+    Case('element_value_should_be', 'id=last_name', 'Doe', True),
+    Case('element_value_should_not_be', 'id=first_name', 'Jane'),
+    Case('element_value_should_contain', 'id=first_name', 'Jo'),
+    Case('element_value_should_not_contain', 'id=first_name', 'Ja'),
+    Case('element_focus_should_be_set', 'id=first_name',
+         setup=_focus('id=first_name')),
+    Case('element_focus_should_not_be_set', 'id=first_name'),
+    Case('element_css_attribute_should_be', 'id=paragraph', 'color',
+         'rgba(0, 0, 0, 1)'),
+    Case('get_element_snapshot', 'id=paragraph', 'color'),
+    Case('elements_should_match',
+         'id=first_name', 'value', 'John',
+         'id=first_name', 'class', 'required',
+         'id=paragraph', 'css:color', 'rgba(0, 0, 0, 1)',
+         'id=paragraph', 'width', '200'),
+    Case('wait_until_page_contains_elements', None, 'id=first_name',
+         'id=last_name', 'id=submit'),
+    Case('wait_until_page_contains_elements', None, 'id=spinner',
+         setup=_appear_later, name='wait_until_page_contains_elements (50ms)'),
+    Case('wait_until_page_contains_one_of_these_elements', None, 'id=missing',
+         'id=submit'),
+    Case('wait_until_page_does_not_contain_these_elements', None,
+         'id=missing', 'id=gone'),
+    Case('tap_key', Keys.TAB, Keys.SHIFT, setup=_focus('id=first_name')),
+    Case('define_key_macro', 'select all', 'CTRL+a', 'DELETE'),
+    Case('play_key_macro', 'select all and type', setup=_define_macro),
+    Case('wait_until_element_is_clickable', 'id=submit'),
+    Case('set_wait_poll_schedule', '50ms'),
+    Case('register_webdriver', skip="needs a second driver"),
+    Case('get_connection_pool_stats'),
+    Case('get_element_cache_stats'),
+    Case('get_stale_element_stats'),
+    Case('get_command_count',
+         skip="needs the library to be imported with a command_trace"),
+    Case('undo', setup=_focus('id=first_name')),
+    Case('redo', setup=_focus('id=first_name')),
+    Case('clear_field', 'id=first_name'),
+    Case('send_keys', 'Hello', setup=_focus('id=first_name')),
+    Case('get_child', 'id=list'),
+    Case('get_children', 'id=list'),
+    Case('wait_for_element_to_come_and_go', '//div[@id="spinner"]',
+         setup=_come_and_go),
+    Case('wait_until_box_is_changed', 'id=checkbox', setup=_check),
+    Case('element_exists', 'id=submit'),
+    Case('num_elements_on_page', 'css=li.item'),
+    Case('return_bool', lambda: None),
+    Case('get_created', skip="runs the creator with BuiltIn().run_keyword"),
+    Case('wait_until_element_has_class', 'id=first_name', 'field required'),
+    Case('wait_until_element_has_class', 'id=paragraph', 'highlighted',
+         setup=_add_class_later,
+         name='wait_until_element_has_class (50ms)'),
+    Case('wait_until_element_does_not_have_class', 'id=first_name',
+         'missing'),
+    Case('element_should_have_class', 'id=first_name', 'field required'),
+    Case('element_should_not_have_class', 'id=first_name', 'missing'),
+    Case('validate_field_is_not_editable',
+         skip="compares values with BuiltIn().should_be_equal_as_strings"),
+    Case('select_from_list_by_text', 'id=country', 'France'),
+    Case('select_from_list_by_text', 'id=country', 'France', 'exact', True,
+         name='select_from_list_by_text (in browser)'),
+    Case('get_webelements_return_empty_for_none', 'css=li.item'),
+    Case('blur', 'id=first_name', setup=_focus('id=first_name')),
+]
@@ -0,0 +1,714 @@
+"""In-process stand-in for a WebDriver server, speaking the JSON wire protocol
+of Selenium 2 over HTTP, with a fake page and a configurable latency per
+command.
+
+No JavaScript is run: the functions of the runtime of
+`Selenium2LibraryExtension.utils.scripts` are emulated on the fake page and
+the other scripts return null. Only the locators used by the benchmarks are
+supported: ids, names, tags, simple CSS selectors (`tag#id.class[attribute="value"]`, comma separated) and simple
+XPaths (`//tag[@attribute='value' or ...]`, `./*[1]`)."""
+
+from __future__ import print_function
+
+import itertools
+import json
+import re
+import socket
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:  # Python 3
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from Selenium2LibraryExtension.utils import scripts
+
+SUCCESS, NO_SUCH_ELEMENT, STALE_ELEMENT, INVALID_SELECTOR = 0, 7, 10, 32
+
+
+
+class WebDriverError(Exception):
+
+    def __init__(self, status, message):
+        Exception.__init__(self, message)
+        self.status = status
+
+
+class FakeElement(object):
+    """An element of the fake page."""
+
+    _refs = itertools.count(1)
+
+    def __init__(self, tag, parent=None, text='', value=None, classes='',
+                 displayed=True, enabled=True, size=(100, 20), styles=None,
+                 on_click=None, **attributes):
+
+        self.ref = 'element-%d' % next(FakeElement._refs)
+        self.tag = tag
+        self.parent = parent
+        self.text = text
+        self.value = value
+        self.classes = classes.split()
+        self.displayed = displayed
+        self.enabled = enabled
+        self.size = size
+        self.styles = dict(styles or {})
+        self.on_click = on_click
+        self.selected = False
+        self.attributes = dict((name.rstrip('_'), value)
+                               for name, value in attributes.items())
+
+    def attribute(self, name):
+        if name == 'value':
+            return self.value
+        if name == 'class':
+            return ' '.join(self.classes) if self.classes else None
+        if name in ('checked', 'selected'):
+            return 'true' if self.selected else None
+        if name == 'disabled':
+            return None if self.enabled else 'true'
+        return self.attributes.get(name)
+
+    def matches(self, name, value):
+        return self.attribute(name) == value
+
+
+class FakePage(object):
+    """Elements of the fake page, in document order, and the changes
+    scheduled to happen to them."""
+
+    def __init__(self):
+
+        self.url = 'about:blank'
+        self.title = ''
+        self.elements = []
+        self.refs = {}
+        self.active = None
+        self.runtime = False
+        self.marks = {}
+        # counts the elements added and removed, as the MutationObserver of
+        # the runtime counts the mutations of the document
+        self.generation = 0
+        self._changes = []
+        self._lock = threading.RLock()
+
+    def add(self, tag, **properties):
+        element = FakeElement(tag, **properties)
+        with self._lock:
+            self.elements.append(element)
+            self.refs[element.ref] = element
+            self.generation += 1
+        return element
+
+    def remove(self, element):
+        with self._lock:
+            removed = set([element] + self.descendants(element))
+            self.elements = [other for other in self.elements
+                             if other not in removed]
+            for other in removed:
+                del self.refs[other.ref]
+            self.generation += 1
+            if self.active is element:
+                self.active = None
+
+    def later(self, delay, change):
+        """Makes `change()` happen in `delay` seconds."""
+
+        with self._lock:
+            self._changes.append((time.time() + delay, change))
+            self._changes.sort(key=lambda item: item[0])
+
+    def update(self):
+        """Applies the scheduled changes that are due."""
+
+        with self._lock:
+            now = time.time()
+            while self._changes and self._changes[0][0] <= now:
+                self._changes.pop(0)[1]()
+
+    def next_change(self):
+        with self._lock:
+            return self._changes[0][0] if self._changes else None
+
+    def get(self, ref):
+        if ref not in self.refs:
+            raise WebDriverError(STALE_ELEMENT, "Element %s is stale" % ref)
+        return self.refs[ref]
+
+    def children(self, element):
+        return [child for child in self.elements if child.parent is element]
+
+    def descendants(self, element):
+        # parents come before their children in document order
+        ancestors = set([element])
+        found = []
+        for other in self.elements:
+            if other.parent in ancestors:
+                ancestors.add(other)
+                found.append(other)
+        return found
+
+    # locators of the driver
+
+    def find(self, using, value, root=None):
+
+        if using == 'xpath':
+            return self._xpath(value, root)
+        scope = self.descendants(root) if root else list(self.elements)
+
+        if using == 'id':
+            return [e for e in scope if e.matches('id', value)]
+        if using == 'name':
+            return [e for e in scope if e.matches('name', value)]
+        if using == 'tag name':
+            return [e for e in scope if e.tag == value]
+        if using == 'class name':
+            return [e for e in scope if value in e.classes]
+        if using == 'css selector':
+            return self._css(value, scope)
+        if using == 'link text':
+            return [e for e in scope if e.tag == 'a' and e.text == value]
+        raise WebDriverError(INVALID_SELECTOR,
+                             "Unsupported locator strategy %s" % using)
+
+    def _css(self, selector, scope):
+
+        simple = re.compile(r'^(\w+|\*)?((?:#[\w-]+|\.[\w-]+|'
+                            r'\[[\w-]+=["\']?[^\]"\']*["\']?\])*)$')
+        tests = []
+        for part in selector.split(','):
+            match = simple.match(part.strip())
+            if not match:
+                raise WebDriverError(INVALID_SELECTOR,
+                                     "Unsupported selector %s" % part)
+            tag = match.group(1)
+            filters = re.findall(r'#([\w-]+)|\.([\w-]+)|'
+                                 r'\[([\w-]+)=["\']?([^\]"\']*)["\']?\]',
+                                 match.group(2))
+            tests.append((tag, filters))
+
+        def matches(element, tag, filters):
+            if tag not in (None, '*', element.tag):
+                return False
+            for id_, class_, name, value in filters:
+                if id_ and not element.matches('id', id_):
+                    return False
+                if class_ and class_ not in element.classes:
+                    return False
+                if name and not element.matches(name, value):
+                    return False
+            return True
+
+        return [e for e in scope
+                if any(matches(e, tag, filters) for tag, filters in tests)]
+
+    def _xpath(self, xpath, root=None):
+
+        match = re.match(r'^(\.)?(//?)(\w+|\*)(?:\[(.+)\])?$', xpath)
+        if not match or (match.group(1) and root is None):
+            raise WebDriverError(INVALID_SELECTOR,
+                                 "Unsupported XPath %s" % xpath)
+        relative, axis, tag, predicate = match.groups()
+
+        if axis == '//':
+            scope = self.descendants(root) if relative else list(self.elements)
+        else:
+            scope = self.children(root if relative else None)
+        found = [e for e in scope if tag in ('*', e.tag)]
+
+        if predicate is None:
+            return found
+        if predicate.isdigit():
+            position = int(predicate)
+            return found[position - 1:position]
+
+        terms = re.findall(r'@([\w-]+)\s*=\s*["\']([^"\']*)["\']', predicate)
+        if not terms or len(terms) != predicate.count('@'):
+            raise WebDriverError(INVALID_SELECTOR,
+                                 "Unsupported XPath %s" % xpath)
+        return [e for e in found
+                if any(e.matches(name, value) for name, value in terms)]
+
+    # locators of the in-browser scripts
+
+    def locate(self, locator):
+
+        strategy, criteria = locator
+        if strategy in ('id', 'name'):
+            return self.find(strategy, criteria)
+        if strategy == 'identifier':
+            return self.find('id', criteria) + self.find('name', criteria)
+        if strategy == 'default':
+            return [e for e in self.elements
+                    if e.matches('id', criteria) or e.matches('name', criteria)]
+        if strategy == 'xpath':
+            return self.find('xpath', criteria)
+        if strategy == 'css':
+            return self.find('css selector', criteria)
+        if strategy == 'tag':
+            return self.find('tag name', criteria)
+        if strategy == 'input':
+            return [self.active] if self.active else []
+        if strategy == 'meta_name':
+            return [e for e in self.elements
+                    if e.tag == 'meta' and e.matches('name', criteria)]
+        if strategy in ('first_tag', 'last_tag'):
+            found = self.find('css selector', criteria)
+            return found[:1] if strategy == 'first_tag' else found[-1:]
+        raise WebDriverError(INVALID_SELECTOR,
+                             "Unsupported locator strategy %s" % strategy)
+
+    def target(self, target):
+        """The element of a script argument, which is either an element or
+        a locator."""
+
+        if isinstance(target, list):
+            found = self.locate(target)
+            return found[0] if found else None
+        return target
+
+    # actions
+
+    def click(self, element):
+        if element.tag in ('input', 'textarea', 'select', 'button', 'a'):
+            self.active = element
+        if element.tag == 'option':
+            for option in self.children(element.parent):
+                option.selected = option is element
+        if element.on_click:
+            element.on_click()
+
+    def type(self, element, keys):
+        self.active = element
+        for key in keys:
+            if key == Keys.BACKSPACE:
+                element.value = (element.value or '')[:-1]
+            elif not Keys.NULL <= key <= u'\uf8ff':
+                element.value = (element.value or '') + key
+
+
+class FakeWebDriverServer(object):
+    """HTTP server emulating a WebDriver server and its browser. Every
+    command is delayed by `latency` seconds, or by the latency given for its
+    name (see RemoteConnection) in `latencies`, and counted."""
+
+    def __init__(self, page=None, latency=0.0, latencies=None):
+
+        self.page = page or FakePage()
+        self.latency = latency
+        self.latencies = dict(latencies or {})
+        self.commands = []
+        self._routes = self._build_routes()
+        self.sent = 0
+        self._connections = set()
+        self._functions = {
+            'findByLocator': self._find_by_locator,
+            'findPresence': self._find_presence,
+            'countElements': self._count_elements,
+            'elementFocus': self._element_focus,
+            'elementClasses': self._element_classes,
+            'elementSnapshots': self._element_snapshots,
+            'clearField': self._clear_field,
+            'bulkInput': self._bulk_input,
+            'findOptionByText': self._find_option_by_text,
+            'markElements': self._mark_elements,
+            'findUnmarked': self._find_unmarked,
+            'clickability': self._clickability,
+            'waitForCondition': self._wait_for_condition,
+            'blur': self._blur,
+            'generation': self._generation,
+        }
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1'
+            # the response is sent in a single packet
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                payload = json.dumps(server.handle(
+                    self.command, self.path, body)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type',
+                                 'application/json;charset=UTF-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_DELETE = _respond
+
+            def setup(self):
+                BaseHTTPRequestHandler.setup(self)
+                server._connections.add(self.connection)
+
+            def finish(self):
+                server._connections.discard(self.connection)
+                BaseHTTPRequestHandler.finish(self)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self._server.server_port
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and closes the keep-alive connections, whose
+        handler threads would otherwise outlive the interpreter."""
+
+        self._server.shutdown()
+        for connection in list(self._connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+        self._server.server_close()
+
+    def reset(self):
+        """Forgets the commands and the bytes received so far."""
+
+        del self.commands[:]
+        self.sent = 0
+
+    # protocol
+
+    @staticmethod
+    def _build_routes():
+
+        commands = RemoteConnection('http://127.0.0.1:1',
+                                    resolve_ip=False)._commands
+        routes = []
+        # the W3C variants share the paths of the JSON wire commands
+        for name in sorted(commands, key=lambda name: name.startswith('w3c')):
+            method, template = commands[name]
+            pattern = re.sub(r'\\\$(\w+)', r'(?P<\1>[^/]+)', re.escape(template))
+            routes.append((method, re.compile('^%s$' % pattern), name))
+        return routes
+
+    def handle(self, method, path, body):
+
+        for route_method, pattern, name in self._routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                break
+        else:
+            return {'status': 9, 'value': {'message': 'Unknown command %s %s'
+                                           % (method, path)}}
+
+        self.commands.append(name)
+        self.sent += len(body)
+        time.sleep(self.latencies.get(name, self.latency))
+
+        params = dict(json.loads(body.decode('utf-8')) if body else {})
+        params.update(match.groupdict())
+        self.page.update()
+        try:
+            value = getattr(self, '_' + name, lambda params: None)(params)
+        except WebDriverError as error:
+            return {'sessionId': 'fake', 'status': error.status,
+                    'value': {'message': str(error)}}
+        if name == 'newSession':
+            return {'sessionId': 'fake', 'status': SUCCESS, 'value': value}
+        return {'sessionId': 'fake', 'status': SUCCESS,
+                'value': self._encode(value)}
+
+    def _encode(self, value):
+        if isinstance(value, FakeElement):
+            return {'ELEMENT': value.ref}
+        if isinstance(value, (list, tuple)):
+            return [self._encode(item) for item in value]
+        if isinstance(value, dict):
+            return dict((key, self._encode(item))
+                        for key, item in value.items())
+        return value
+
+    def _decode(self, value):
+        if isinstance(value, dict) and 'ELEMENT' in value:
+            return self.page.get(value['ELEMENT'])
+        if isinstance(value, list):
+            return [self._decode(item) for item in value]
+        return value
+
+    def _element(self, params):
+        return self.page.get(params['id'])
+
+    # commands
+
+    def _newSession(self, params):
+        return {'browserName': 'fake', 'javascriptEnabled': True}
+
+    def _get(self, params):
+        self.page.url = params['url']
+
+    def _getCurrentUrl(self, params):
+        return self.page.url
+
+    def _getTitle(self, params):
+        return self.page.title
+
+    def _getCurrentWindowHandle(self, params):
+        return 'main'
+
+    def _getWindowHandles(self, params):
+        return ['main']
+
+    def _getCookies(self, params):
+        return []
+
+    def _findElement(self, params):
+        found = self._findElements(params)
+        if not found:
+            raise WebDriverError(NO_SUCH_ELEMENT, "No element matches %s=%s" %
+                                 (params['using'], params['value']))
+        return found[0]
+
+    def _findElements(self, params):
+        return self.page.find(params['using'], params['value'])
+
+    def _findChildElement(self, params):
+        found = self._findChildElements(params)
+        if not found:
+            raise WebDriverError(NO_SUCH_ELEMENT, "No child matches %s=%s" %
+                                 (params['using'], params['value']))
+        return found[0]
+
+    def _findChildElements(self, params):
+        return self.page.find(params['using'], params['value'],
+                              self._element(params))
+
+    def _getActiveElement(self, params):
+        return self.page.active or self.page.find('tag name', 'body')[0]
+
+    def _clickElement(self, params):
+        self.page.click(self._element(params))
+
+    def _sendKeysToElement(self, params):
+        self.page.type(self._element(params), params['value'])
+
+    def _sendKeysToActiveElement(self, params):
+        if self.page.active:
+            self.page.type(self.page.active, params['value'])
+
+    def _clearElement(self, params):
+        self._element(params).value = ''
+
+    def _getElementAttribute(self, params):
+        return self._element(params).attribute(params['name'])
+
+    def _getElementText(self, params):
+        return self._element(params).text
+
+    def _getElementTagName(self, params):
+        return self._element(params).tag
+
+    def _isElementDisplayed(self, params):
+        return self._element(params).displayed
+
+    def _isElementEnabled(self, params):
+        return self._element(params).enabled
+
+    def _isElementSelected(self, params):
+        return self._element(params).selected
+
+    def _getElementSize(self, params):
+        width, height = self._element(params).size
+        return {'width': width, 'height': height}
+
+    def _getElementLocation(self, params):
+        return {'x': 0, 'y': 0}
+
+    def _getElementValueOfCssProperty(self, params):
+        return self._element(params).styles.get(params['propertyName'], '')
+
+    def _elementEquals(self, params):
+        return params['id'] == params['other']
+
+    def _executeScript(self, params):
+        script = params['script']
+        if script in (scripts.RUNTIME_CALL, scripts.RUNTIME_CALL_ASYNC):
+            if not self.page.runtime:
+                return scripts.RUNTIME_MISSING
+        elif script in (scripts.RUNTIME + scripts.RUNTIME_CALL,
+                        scripts.RUNTIME + scripts.RUNTIME_CALL_ASYNC):
+            self.page.runtime = True
+        else:
+            return None
+        name, args = self._decode(params['args'])
+        return self._functions[name](*args)
+
+    _executeAsyncScript = _executeScript
+
+    # functions of the runtime
+
+    def _find_by_locator(self, locator):
+        return self.page.locate(locator)
+
+    def _find_presence(self, locators):
+        return [bool(self.page.locate(locator)) for locator in locators]
+
+    def _count_elements(self, locator, limit):
+        count = len(self.page.locate(locator))
+        return min(count, limit) if limit else count
+
+    def _element_focus(self, target):
+        element = self.page.target(target)
+        return None if element is None else element is self.page.active
+
+    def _element_classes(self, targets, names):
+        results = []
+        for target in targets:
+            element = self.page.target(target)
+            results.append(None if element is None else
+                           [element.classes,
+                            [name in element.classes for name in names]])
+        return results
+
+    def _element_snapshots(self, targets, styles):
+        snapshots = []
+        for target in targets:
+            element = self.page.target(target)
+            if element is None:
+                snapshots.append(None)
+                continue
+            width, height = element.size
+            snapshots.append({
+                'value': element.value, 'text': element.text,
+                'classes': element.classes,
+                'styles': dict((name, element.styles.get(name, ''))
+                               for name in styles),
+                'rect': {'x': 0, 'y': 0, 'width': width, 'height': height},
+                'size': {'width': width, 'height': height},
+                'focused': element is self.page.active,
+                'visible': element.displayed})
+        return snapshots
+
+    def _clear_field(self, target):
+        element = self.page.target(target)
+        if element is None:
+            return None
+        if not element.enabled:
+            return [False, element.value]
+        element.value = ''
+        self.page.active = element
+        return [True, '']
+
+    def _bulk_input(self, target, text):
+        element = self.page.target(target)
+        if element is None:
+            return None
+        if not element.enabled:
+            return [element, False]
+        element.value = text
+        self.page.active = element
+        return [element, True]
+
+    def _find_option_by_text(self, target, text, match, select):
+        element = self.page.target(target)
+        if element is None:
+            return None
+
+        def normalize(value):
+            return ' '.join(value.split())
+
+        for option in self.page.children(element):
+            if (match == 'exact' and option.text == text) or \
+                    (match == 'normalized' and
+                     normalize(option.text) == normalize(text)) or \
+                    (match == 'partial' and text in option.text):
+                if select:
+                    self.page.click(option)
+                return [option]
+        return []
+
+    def _mark_elements(self, locator, token):
+        marked = self.page.locate(locator)
+        self.page.marks[token] = marked
+        return len(marked)
+
+    def _find_unmarked(self, locator, token, forget):
+        marked = self.page.marks.get(token, [])
+        unmarked = [e for e in self.page.locate(locator) if e not in marked]
+        if unmarked or forget:
+            self.page.marks.pop(token, None)
+        return unmarked
+
+    def _clickability(self, target, settle):
+        element = self.page.target(target)
+        if element is None:
+            return None
+        problems = []
+        if not element.displayed:
+            problems.append('not visible')
+        elif not element.enabled:
+            problems.append('disabled')
+        return [element, problems]
+
+    def _blur(self, element):
+        if self.page.active is element:
+            self.page.active = None
+
+    def _generation(self, elements):
+        # stale elements were already rejected when decoding the arguments
+        return ['fake:%d' % self.page.generation, True]
+
+    def _condition(self, locators, condition, args):
+
+        def first():
+            found = self.page.locate(locators[0])
+            return found[0] if found else None
+
+        if condition == 'present':
+            return all(self.page.locate(locator) for locator in locators)
+        if condition == 'any_present':
+            return any(self.page.locate(locator) for locator in locators)
+        if condition == 'absent':
+            return not any(self.page.locate(locator) for locator in locators)
+        element = first()
+        if element is None:
+            return False
+        if condition == 'focus':
+            return (element is self.page.active) == args[0]
+        if condition == 'attribute':
+            value = element.attribute(args[2])
+            value = 'None' if value is None else value
+            value = value.strip() if args[3] else value
+            return args[1] in value if args[0] else value == args[1]
+        if condition == 'has_class':
+            return all((name in element.classes) == args[1]
+                       for name in args[0])
+        raise WebDriverError(13, "Unknown condition %s" % condition)
+
+    def _wait_for_condition(self, locators, condition, args, seconds):
+        deadline = time.time() + seconds
+        while True:
+            self.page.update()
+            if self._condition(locators, condition, args):
+                return True
+            now = time.time()
+            if now >= deadline:
+                return False
+            change = self.page.next_change()
+            time.sleep(max(0, min(deadline, change or deadline) - now))
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+
+"""Measures the WebDriver round trips, wall time and allocations of every
+keyword of Selenium2LibraryExtension, and of the patched wait loop, against
+an in-process fake WebDriver server. No browser is needed.
+
+The runtime of the library is installed in the page beforehand, as it is
+after the first keyword run on a page. Allocations are the objects still alive after the keyword (garbage collected)
+and, when tracemalloc is available, the peak memory allocated while it ran.
+The fake server runs in the same process, so its own allocations are counted
+too: they are the same for the same commands, and differences between two
+runs of a case come from the library."""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import sys
+import time
+from os.path import abspath, dirname, join
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+CURDIR = dirname(abspath(__file__))
+sys.path.insert(0, join(CURDIR, '..', '..', 'src'))
+
+from Selenium2LibraryExtension import Selenium2LibraryExtension
+from Selenium2LibraryExtension.keywords import _keywords
+
+from cases import CASES, Case, build_page
+from fakewebdriver import FakePage, FakeWebDriverServer
+
+WAIT_LOOP_POLLS = 5
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--latency', type=float, default=0.001,
+                        help="latency of every command in seconds "
+                        "(default: %(default)s)")
+    parser.add_argument('--command-latency', action='append', default=[],
+                        metavar='NAME=SECONDS',
+                        help="latency of the command NAME, as named by "
+                        "Selenium's RemoteConnection (e.g. executeScript)")
+    parser.add_argument('--iterations', type=int, default=5,
+                        help="runs of every case (default: %(default)s)")
+    parser.add_argument('--keyword', action='append', default=[],
+                        help="only runs the cases of this keyword")
+    parser.add_argument('--output', help="also writes the results as JSON "
+                        "to this file")
+    args = parser.parse_args()
+
+    args.latencies = {}
+    for value in args.command_latency:
+        name, _, seconds = value.partition('=')
+        args.latencies[name] = float(seconds)
+    return args
+
+
+def measure(server, library, case, run):
+    """Runs `run()` on a fresh page, returning the commands it sent, its wall
+    time, the objects it left, the peak memory it allocated and the bytes it
+    sent."""
+
+    server.page = FakePage()
+    build_page(server.page)
+    server.page.runtime = True
+    if case.setup:
+        case.setup(library, server.page)
+
+    gc.collect()
+    objects = len(gc.get_objects())
+    if tracemalloc:
+        tracemalloc.start()
+    server.reset()
+
+    start = time.time()
+    run()
+    wall = time.time() - start
+
+    commands = list(server.commands)
+    sent = server.sent
+    peak = None
+    if tracemalloc:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    gc.collect()
+    return commands, wall, len(gc.get_objects()) - objects, peak, sent
+
+
+def wait_loop(library, server):
+    """Polls the patched `_wait_until_no_error` until an element appears,
+    which happens on the WAIT_LOOP_POLLS poll."""
+
+    polls = []
+
+    def poll():
+        polls.append(None)
+        if len(polls) == WAIT_LOOP_POLLS:
+            server.page.add('div', id='spinner')
+        return library._wait_for_element('id=spinner')
+
+    return lambda: library._wait_until_no_error(None, poll)
+
+
+def run_case(server, library, case, iterations):
+
+    runs = []
+    for _ in range(iterations):
+        if case.keyword == '_wait_until_no_error':
+            run = wait_loop(library, server)
+        else:
+            keyword = getattr(library, case.keyword)
+            run = lambda: keyword(*case.args)
+        runs.append(measure(server, library, case, run))
+
+    count = float(len(runs))
+    commands = runs[-1][0]
+    result = {
+        'name': case.name,
+        'round_trips': sum(len(run[0]) for run in runs) / count,
+        'sent_kib': sum(run[4] for run in runs) / count / 1024,
+        'wall_ms': sum(run[1] for run in runs) / count * 1000,
+        'objects': sum(run[2] for run in runs) / count,
+        'peak_kib': sum(run[3] for run in runs) / count / 1024
+        if tracemalloc else None,
+        'commands': dict((name, commands.count(name))
+                         for name in set(commands))
+    }
+    if case.keyword == '_wait_until_no_error':
+        result['round_trips_per_poll'] = result['round_trips'] / WAIT_LOOP_POLLS
+    return result
+
+
+def report(results):
+
+    width = max(len(result['name']) for result in results)
+    print("%-*s %8s %8s %9s %8s %9s  %s" % (
+        width, 'case', 'trips', 'KiB sent', 'wall ms', 'objects', 'peak KiB',
+        'commands'))
+    for result in results:
+        if 'skipped' in result:
+            print("%-*s  %s" % (width, result['name'], result['skipped']))
+        elif 'error' in result:
+            print("%-*s  ERROR %s" % (width, result['name'], result['error']))
+        else:
+            print("%-*s %8.1f %8.1f %9.1f %8.0f %9s  %s" % (
+                width, result['name'], result['round_trips'],
+                result['sent_kib'], result['wall_ms'], result['objects'],
+                '%.1f' % result['peak_kib'] if tracemalloc else '-',
+                ', '.join('%s x%d' % item
+                          for item in sorted(result['commands'].items())) +
+                (' (%.1f per poll)' % result['round_trips_per_poll']
+                 if 'round_trips_per_poll' in result else '')))
+
+
+def main():
+
+    args = parse_args()
+    server = FakeWebDriverServer(latency=args.latency,
+                                 latencies=args.latencies).start()
+    # the commands are sent over keep-alive connections, as real tests
+    # would with a connection pool
+    library = Selenium2LibraryExtension(timeout=5, poll_jitter=0,
+                                        run_on_failure='Nothing',
+                                        connection_pool_size=4)
+    library.open_browser('about:blank', 'chrome', remote_url=server.url)
+
+    keywords = sorted(name for name in dir(_keywords)
+                      if not name.startswith('_') and
+                      callable(getattr(_keywords, name)))
+    cases = CASES + [Case('_wait_until_no_error',
+                          name='patched wait loop (%d polls)' %
+                          WAIT_LOOP_POLLS)]
+    covered = set(case.keyword for case in cases)
+    cases += [Case(name, skip="no case") for name in keywords
+              if name not in covered]
+    if args.keyword:
+        cases = [case for case in cases if case.keyword in args.keyword]
+
+    results = []
+    try:
+        for case in cases:
+            if case.skip:
+                results.append({'name': case.name,
+                                'skipped': "skipped: %s" % case.skip})
+                continue
+            try:
+                results.append(run_case(server, library, case,
+                                        args.iterations))
+            except Exception as e:
+                results.append({'name': case.name, 'error': repr(e)})
+    finally:
+        library.close_all_browsers()
+        library._connection_pool.close_all()
+        server.stop()
+
+    report(results)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+    return min(len([result for result in results if 'error' in result]), 255)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+
+"""Measures how the WebDriver round trips, the data received and the wall
+time of the keywords grow with the size of the page, on the pages generated
+by the test server (see testserver.GENERATORS).
+
+The keywords run against the fake WebDriver server by default, with fake
+pages of the same shape as the generated ones, which gives the round trips
+and data without any browser. With --browser, they run in a real browser
+against the test server, which also gives meaningful wall times."""
+
+from __future__ import print_function
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from os.path import abspath, dirname, join
+
+CURDIR = dirname(abspath(__file__))
+sys.path.insert(0, join(CURDIR, '..', '..', 'src'))
+sys.path.insert(0, join(CURDIR, '..', 'resources', 'testserver'))
+
+from selenium.webdriver.remote import utils
+
+from Selenium2LibraryExtension import Selenium2LibraryExtension
+from Selenium2LibraryExtension.utils.commandtracer import observe_commands
+
+from fakewebdriver import FakePage, FakeWebDriverServer
+from testserver import StoppableHttpRequestHandler, ThreadingHttpServer
+
+SIZES = (10, 100, 1000, 10000, 100000)
+
+
+# fake pages of the same shape as the ones of testserver.GENERATORS
+
+def fake_table(page, rows=100, columns=3):
+    body = page.add('body')
+    table = page.add('table', parent=body, id='table')
+    tbody = page.add('tbody', parent=table, id='rows')
+    for row in range(rows):
+        tr = page.add('tr', parent=tbody, id='row-%d' % row, classes='row')
+        for column in range(columns):
+            page.add('td', parent=tr, text='Cell %d.%d' % (row, column))
+
+
+def fake_select(page, options=100):
+    body = page.add('body')
+    select = page.add('select', parent=body, id='select')
+    for option in range(options):
+        page.add('option', parent=select, text='Option %d' % option,
+                 value=str(option))
+
+
+def fake_nested(page, depth=100):
+    parent = page.add('body')
+    for level in range(depth):
+        parent = page.add('div', parent=parent, id='level-%d' % level,
+                          classes='level')
+    page.add('p', parent=parent, id='deepest', text='Deepest')
+
+
+def fake_mutating(page, items=100, interval=100):
+    body = page.add('body')
+    page.add('p', parent=body, id='ticks', text='0')
+    ul = page.add('ul', parent=body, id='items')
+    for item in range(items):
+        page.add('li', parent=ul, text='Item %d' % item, classes='item')
+    page.later(interval / 1000.0, lambda: page.add('div', parent=body,
+                                                   id='ready'))
+
+
+FAKE_PAGES = {
+    'table': fake_table,
+    'select': fake_select,
+    'nested': fake_nested,
+    'mutating': fake_mutating,
+}
+
+
+class ScalingCase(object):
+    """Runs `keyword` on the generated page `kind` of size `n`, built with
+    the arguments `page(n)`, with the arguments `args(n)`."""
+
+    def __init__(self, name, kind, page, keyword, args):
+
+        self.name = name
+        self.kind = kind
+        self.page = page
+        self.keyword = keyword
+        self.args = args
+
+
+CASES = [
+    ScalingCase('num_elements_on_page', 'table',
+                lambda n: {'rows': n, 'columns': 1},
+                'num_elements_on_page', lambda n: ['css=tr.row']),
+    ScalingCase('num_elements_on_page (xpath)', 'table',
+                lambda n: {'rows': n, 'columns': 1},
+                'num_elements_on_page', lambda n: ['//tr[@class="row"]']),
+    ScalingCase('num_elements_on_page (nested)', 'nested',
+                lambda n: {'depth': n},
+                'num_elements_on_page', lambda n: ['css=div.level']),
+    ScalingCase('get_children', 'table',
+                lambda n: {'rows': n, 'columns': 1},
+                'get_children', lambda n: ['id=rows']),
+    ScalingCase('select_from_list_by_text', 'select',
+                lambda n: {'options': n},
+                'select_from_list_by_text',
+                lambda n: ['id=select', 'Option %d' % (n - 1)]),
+    ScalingCase('select_from_list_by_text (in browser)', 'select',
+                lambda n: {'options': n},
+                'select_from_list_by_text',
+                lambda n: ['id=select', 'Option %d' % (n - 1), 'exact', True]),
+    ScalingCase('wait_until_page_contains_elements', 'table',
+                lambda n: {'rows': n, 'columns': 1},
+                'wait_until_page_contains_elements',
+                lambda n: [None, 'id=row-%d' % (n - 1), 'css=tr.row']),
+    ScalingCase('wait_until_page_contains_one_of_these_elements', 'table',
+                lambda n: {'rows': n, 'columns': 1},
+                'wait_until_page_contains_one_of_these_elements',
+                lambda n: [None, 'id=missing', 'id=row-%d' % (n - 1)]),
+    ScalingCase('wait_until_page_does_not_contain_these_elements', 'table',
+                lambda n: {'rows': n, 'columns': 1},
+                'wait_until_page_does_not_contain_these_elements',
+                lambda n: [None, 'id=missing', 'css=tr.missing']),
+    ScalingCase('wait_until_page_contains_elements (mutating)', 'mutating',
+                lambda n: {'items': n, 'interval': 100},
+                'wait_until_page_contains_elements',
+                lambda n: [None, 'id=ready']),
+]
+
+
+class CommandCounter(object):
+    """Counts the commands sent by a driver and the bytes received."""
+
+    def __init__(self):
+
+        self.commands = 0
+        self.received = 0
+
+    def command_executed(self, command, seconds, params, response):
+
+        self.commands += 1
+        self.received += len(utils.dump_json(response))
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default=','.join(map(str, SIZES)),
+                        help="comma separated sizes of the pages "
+                        "(default: %(default)s)")
+    parser.add_argument('--browser', help="runs the keywords in this browser "
+                        "instead of the fake WebDriver server")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="latency of the commands of the fake WebDriver "
+                        "server in seconds (default: %(default)s)")
+    parser.add_argument('--case', action='append', default=[],
+                        help="only runs this case")
+    parser.add_argument('--output', help="also writes the results as JSON "
+                        "to this file")
+    args = parser.parse_args()
+    args.sizes = [int(size) for size in args.sizes.split(',')]
+    return args
+
+
+def growth(values, sizes):
+    """Describes how `values` grow from the smallest to the largest size."""
+
+    if len(values) < 2 or values[0] == values[-1]:
+        return 'constant'
+    if not values[0]:
+        return 'grows'
+    ratio = float(values[-1]) / values[0]
+    if ratio >= float(sizes[-1]) / sizes[0] / 2:
+        return 'O(n)'
+    return 'grows x%.1f' % ratio
+
+
+def report(results, sizes):
+
+    width = max(len(case) for case in results)
+    for title, key, template in (('round trips', 'round_trips', '%d'),
+                                 ('KiB received', 'kib', '%.1f'),
+                                 ('wall ms', 'wall_ms', '%.1f')):
+        print('\n%-*s %s  growth' % (width, title,
+                                     ' '.join('%9d' % size for size in sizes)))
+        for case, runs in results.items():
+            values = [runs.get(str(size), {}).get(key) for size in sizes]
+            cells = ['%9s' % (template % value if value is not None else '-')
+                     for value in values]
+            measured = [(size, value) for size, value in zip(sizes, values)
+                        if value is not None]
+            print('%-*s %s  %s' % (width, case, ' '.join(cells),
+                                   growth([value for _, value in measured],
+                                          [size for size, _ in measured])))
+
+
+def main():
+
+    args = parse_args()
+    # the commands are sent over keep-alive connections, as real tests
+    # would with a connection pool
+    library = Selenium2LibraryExtension(timeout=10, poll_jitter=0,
+                                        run_on_failure='Nothing',
+                                        connection_pool_size=4)
+
+    if args.browser:
+        server = ThreadingHttpServer(('localhost', 0),
+                                     StoppableHttpRequestHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        url = 'http://localhost:%d/generated/' % server.server_port
+        library.open_browser('about:blank', args.browser)
+    else:
+        server = FakeWebDriverServer(latency=args.latency).start()
+        library.open_browser('about:blank', 'chrome', remote_url=server.url)
+
+    counter = CommandCounter()
+    observe_commands(library._current_browser(), counter)
+
+    cases = [case for case in CASES
+             if not args.case or case.name in args.case]
+    results = OrderedDict((case.name, {}) for case in cases)
+    try:
+        for size in args.sizes:
+            for case in cases:
+                arguments = case.page(size)
+                if args.browser:
+                    library.go_to(url + case.kind + '?' + '&'.join(
+                        '%s=%d' % item for item in sorted(arguments.items())))
+                    # installs the runtime of the library in the page
+                    library.element_exists('tag=body')
+                else:
+                    server.page = FakePage()
+                    server.page.runtime = True
+                    FAKE_PAGES[case.kind](server.page, **arguments)
+
+                keyword = getattr(library, case.keyword)
+                counter.commands = counter.received = 0
+                start = time.time()
+                try:
+                    keyword(*case.args(size))
+                except Exception as e:
+                    print("%s failed with %d elements: %r" %
+                          (case.name, size, e))
+                    continue
+                results[case.name][str(size)] = {
+                    'round_trips': counter.commands,
+                    'kib': counter.received / 1024.0,
+                    'wall_ms': (time.time() - start) * 1000}
+    finally:
+        library.close_all_browsers()
+        library._connection_pool.close_all()
+        if args.browser:
+            server.shutdown()
+            server.server_close()
+        else:
+            server.stop()
+
+    report(results, args.sizes)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,14 +10,112 @@ try:
     from BaseHTTPServer import HTTPServer
     from SimpleHTTPServer import SimpleHTTPRequestHandler
     from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
 except ImportError:  # Python 3
     from http.client import HTTPConnection
     from http.server import SimpleHTTPRequestHandler, HTTPServer
     from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+</head>
+<body>
+%(body)s
+</body>
+</html>
+"""
+
+
+def generate_table(rows=100, columns=3):
+    """Table `table` of `rows` rows `row-<i>` with class `row`, in the body
+    `rows`, each of `columns` cells."""
+    return PAGE % {
+        'title': 'Table of %d rows' % rows,
+        'body': '<table id="table"><tbody id="rows">\n%s\n</tbody></table>' %
+                '\n'.join('<tr id="row-%d" class="row">%s</tr>' % (
+                    row, ''.join('<td>Cell %d.%d</td>' % (row, column)
+                                 for column in range(columns)))
+                    for row in range(rows))}
+
+
+def generate_select(options=100):
+    """List `select` of `options` options `Option <i>`."""
+    return PAGE % {
+        'title': 'List of %d options' % options,
+        'body': '<select id="select">\n%s\n</select>' %
+                '\n'.join('<option value="%d">Option %d</option>' %
+                           (option, option) for option in range(options))}
+
+
+def generate_nested(depth=100):
+    """`depth` nested divs `level-<i>` with class `level`, the deepest one
+    holding the paragraph `deepest`."""
+    return PAGE % {
+        'title': '%d nested levels' % depth,
+        'body': ''.join('<div id="level-%d" class="level">' % level
+                        for level in range(depth)) +
+                '<p id="deepest">Deepest</p>' + '</div>' * depth}
+
+
+def generate_mutating(items=100, interval=100):
+    """List `items` of `items` items with class `item`, one of which toggles
+    the class `tick` every `interval` milliseconds. The paragraph `ticks`
+    holds the number of ticks, and the div `ready` is added on the first
+    one."""
+    return PAGE % {
+        'title': '%d items mutating every %d ms' % (items, interval),
+        'body': '<p id="ticks">0</p>\n<ul id="items">\n%s\n</ul>\n'
+                '<script>\n'
+                'var ticks = 0, items = document.querySelectorAll(".item");\n'
+                'setInterval(function () {\n'
+                '    ticks++;\n'
+                '    items[(ticks - 1) %% items.length].classList.toggle("tick");\n'
+                '    document.getElementById("ticks").textContent = ticks;\n'
+                '    if (ticks === 1) {\n'
+                '        var ready = document.createElement("div");\n'
+                '        ready.id = "ready";\n'
+                '        document.body.appendChild(ready);\n'
+                '    }\n'
+                '}, %d);\n'
+                '</script>' % ('\n'.join('<li class="item">Item %d</li>' % item
+                                          for item in range(items)),
+                               interval)}
+
+
+GENERATORS = {
+    'table': generate_table,
+    'select': generate_select,
+    'nested': generate_nested,
+    'mutating': generate_mutating,
+}
 
 
 class StoppableHttpRequestHandler(SimpleHTTPRequestHandler):
-    """http request handler with QUIT stopping the server"""
+    """http request handler with QUIT stopping the server and the pages
+    generated under /generated/<kind>?<argument>=<integer>, see GENERATORS"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.startswith('/generated/'):
+            return SimpleHTTPRequestHandler.do_GET(self)
+        generator = GENERATORS.get(url.path[len('/generated/'):])
+        if generator is None:
+            return self.send_error(404, "No generated page %s" % url.path)
+        try:
+            arguments = dict((name, int(values[-1])) for name, values
+                             in parse_qs(url.query).items())
+            page = generator(**arguments).encode('utf-8')
+        except (TypeError, ValueError) as error:
+            return self.send_error(400, str(error))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
 
     def do_QUIT(self):
         self.send_response(200)
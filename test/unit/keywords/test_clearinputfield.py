@@ -0,0 +1,20 @@
+import unittest
+
+from mockito import mock, verify, when
+from selenium.webdriver.common.keys import Keys
+
+from Selenium2LibraryExtension import Selenium2LibraryExtension
+
+
+class ClearInputFieldTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lib = Selenium2LibraryExtension()
+        self.element = mock()
+        when(self.lib)._element_find('id=name', True, True).thenReturn(
+            self.element)
+
+    def test_backspace_is_pressed_key_by_key(self):
+        when(self.element).get_attribute('value').thenReturn('ab', 'a', '')
+        self.lib.clear_input_field('id=name', 2)
+        verify(self.element, times=2).send_keys(Keys.BACKSPACE)
@@ -0,0 +1,67 @@
+import unittest
+
+from mockito import mock, verify, when
+from selenium.common.exceptions import TimeoutException
+
+from Selenium2LibraryExtension import Selenium2LibraryExtension
+from Selenium2LibraryExtension.utils import scripts
+
+
+class ClickableTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lib = Selenium2LibraryExtension(timeout=0.5)
+        self.browser = mock()
+        self.element = mock()
+        self.lib._cache.register(self.browser)
+
+    def test_element_is_clicked_once_when_clickable(self):
+        when(self.browser).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button'], True]).thenReturn(
+                [self.element, ['moving']]).thenReturn(
+                    [self.element, []])
+        self.lib.wait_until_element_is_clickable('id=button')
+        verify(self.browser, times=2).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button'], True])
+        verify(self.element, times=1).click()
+
+    def test_element_is_not_clicked_when_not_clickable(self):
+        when(self.browser).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button'], True]).thenReturn(
+                [self.element, ['disabled']])
+        with self.assertRaises(AssertionError) as context:
+            self.lib.wait_until_element_is_clickable('id=button', '0.1')
+        self.assertEqual(
+            str(context.exception),
+            "Element 'id=button' was not clickable (disabled), click "
+            "operation failed")
+        verify(self.element, times=0).click()
+
+    def test_element_is_probed_synchronously_without_script_timeout(self):
+        self.lib.set_selenium_timeout(0)
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'clickability',
+            [['id', 'button'], False]).thenReturn([self.element, []])
+        self.lib.wait_until_element_is_clickable('id=button', '0.1')
+        verify(self.browser, times=0).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button'], True])
+        verify(self.element, times=1).click()
+
+    def test_element_is_probed_synchronously_after_script_timeout(self):
+        when(self.browser).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button'], True]).thenRaise(TimeoutException())
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'clickability',
+            [['id', 'button'], False]).thenReturn(
+                [self.element, ['disabled']]).thenReturn(
+                    [self.element, []])
+        self.lib.wait_until_element_is_clickable('id=button')
+        verify(self.browser, times=1).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button'], True])
+        verify(self.element, times=1).click()
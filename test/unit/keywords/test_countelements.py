@@ -0,0 +1,42 @@
+import unittest
+
+from mockito import mock, verify, when
+
+from Selenium2LibraryExtension import Selenium2LibraryExtension
+from Selenium2LibraryExtension.utils import scripts
+
+
+class CountElementsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lib = Selenium2LibraryExtension()
+        self.browser = mock()
+        self.lib._cache.register(self.browser)
+
+    def test_count_is_done_in_browser(self):
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'countElements',
+            [['css', 'tr'], 0]).thenReturn(50000)
+        self.assertEqual(self.lib.num_elements_on_page('css=tr'), 50000)
+        verify(self.browser, times=0).find_elements_by_css_selector('tr')
+
+    def test_count_with_limit(self):
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'countElements',
+            [['xpath', '//tr'], 3]).thenReturn(3)
+        self.assertEqual(self.lib.num_elements_on_page('//tr', '3'), 3)
+
+    def test_custom_locators_are_counted_from_python(self):
+        when(self.lib).get_webelements('link=Next').thenReturn([1, 2, 3])
+        self.assertEqual(self.lib.num_elements_on_page('link=Next'), 3)
+        self.assertEqual(self.lib.num_elements_on_page('link=Next', 2), 2)
+
+    def test_element_exists_counts_up_to_one(self):
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'countElements',
+            [['id', 'present'], 1]).thenReturn(1)
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'countElements',
+            [['id', 'missing'], 1]).thenReturn(0)
+        self.assertTrue(self.lib.element_exists('id=present'))
+        self.assertFalse(self.lib.element_exists('id=missing'))
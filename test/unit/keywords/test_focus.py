@@ -0,0 +1,82 @@
+import socket
+import unittest
+
+from mockito import mock, verify, when
+
+from Selenium2LibraryExtension import Selenium2LibraryExtension
+from Selenium2LibraryExtension.utils import scripts
+
+
+class FocusTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lib = Selenium2LibraryExtension()
+        self.browser = mock()
+        self.lib._cache.register(self.browser)
+
+    def test_focus_is_checked_in_one_call(self):
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'elementFocus',
+            [['id', 'field']]).thenReturn(True)
+        self.assertTrue(self.lib._has_focus('id=field'))
+        self.lib.element_focus_should_be_set('id=field')
+        self.assertRaises(AssertionError,
+                          self.lib.element_focus_should_not_be_set, 'id=field')
+        verify(self.browser, times=0).find_elements_by_id('field')
+
+    def test_missing_element(self):
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'elementFocus',
+            [['id', 'missing']]).thenReturn(None)
+        self.assertRaises(ValueError, self.lib._has_focus, 'id=missing')
+        self.assertEqual(
+            self.lib._check_element_focus_exp(True, 'id=missing', 1),
+            "Element locator 'id=missing' did not match any elements after "
+            "1 second")
+
+    def test_custom_locators_are_found_from_python(self):
+        element = mock()
+        when(self.lib)._element_find('link=Next', True, True).thenReturn(
+            element)
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'elementFocus',
+            [element]).thenReturn(False)
+        self.assertFalse(self.lib._has_focus('link=Next'))
+
+    def test_browser_checks_once_without_script_timeout(self):
+        self.lib = Selenium2LibraryExtension(timeout=0)
+        self.lib._cache.register(self.browser)
+        when(self.browser).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'waitForCondition',
+            [[['id', 'field']], 'focus', [True], 0]).thenReturn(False)
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'elementFocus',
+            [['id', 'field']]).thenReturn(False)
+        self.assertRaises(AssertionError,
+                          self.lib.wait_until_element_has_focus, 'id=field',
+                          '0.2s')
+        verify(self.browser, times=1).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'waitForCondition',
+            [[['id', 'field']], 'focus', [True], 0])
+
+    def test_browser_wait_ends_before_the_connection_timeout(self):
+        self.lib = Selenium2LibraryExtension(connection_pool_size=1,
+                                             connection_timeout=1)
+        self.lib._cache.register(self.browser)
+        when(self.browser).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'waitForCondition',
+            [[['id', 'field']], 'focus', [True], 0.8]).thenReturn(True)
+        self.lib.wait_until_element_has_focus('id=field', '20s')
+
+    def test_python_waits_when_the_connection_times_out(self):
+        when(self.browser).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'waitForCondition',
+            [[['id', 'field']], 'focus', [True], 8.0]).thenRaise(
+                socket.timeout('timed out'))
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'elementFocus',
+            [['id', 'field']]).thenReturn(False).thenReturn(True)
+        self.lib.wait_until_element_has_focus('id=field', '20s')
+        verify(self.browser, times=1).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'waitForCondition',
+            [[['id', 'field']], 'focus', [True], 8.0])
@@ -0,0 +1,68 @@
+import unittest
+
+from mockito import mock, verify, when
+
+from Selenium2LibraryExtension import Selenium2LibraryExtension
+
+
+class ImplicitWaitSuspensionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lib = Selenium2LibraryExtension(implicit_wait=5)
+        self.browser = mock()
+        self.lib._cache.register(self.browser)
+
+    def test_suspends_and_restores_implicit_wait(self):
+        with self.lib._implicit_wait_suspended():
+            verify(self.browser).implicitly_wait(0)
+        verify(self.browser).implicitly_wait(5)
+
+    def test_restores_implicit_wait_on_error(self):
+        try:
+            with self.lib._implicit_wait_suspended():
+                raise ValueError()
+        except ValueError:
+            pass
+        verify(self.browser).implicitly_wait(5)
+
+    def test_nested_suspensions_restore_once(self):
+        with self.lib._implicit_wait_suspended():
+            with self.lib._implicit_wait_suspended():
+                pass
+            verify(self.browser, times=0).implicitly_wait(5)
+        verify(self.browser, times=1).implicitly_wait(0)
+        verify(self.browser, times=1).implicitly_wait(5)
+
+    def test_nothing_to_suspend_without_implicit_wait(self):
+        self.lib._implicit_wait_in_secs = 0
+        with self.lib._implicit_wait_suspended():
+            pass
+        verify(self.browser, times=0).implicitly_wait(0)
+
+    def test_restores_implicit_wait_of_browser(self):
+        self.lib.set_browser_implicit_wait(2)
+        with self.lib._implicit_wait_suspended():
+            verify(self.browser).implicitly_wait(0)
+        verify(self.browser, times=2).implicitly_wait(2)
+        verify(self.browser, times=0).implicitly_wait(5)
+
+    def test_suspends_implicit_wait_of_browser_without_library_wait(self):
+        self.lib.set_selenium_implicit_wait(0)
+        self.lib.set_browser_implicit_wait(3)
+        with self.lib._implicit_wait_suspended():
+            # once by Set Selenium Implicit Wait, once by the suspension
+            verify(self.browser, times=2).implicitly_wait(0)
+        verify(self.browser, times=2).implicitly_wait(3)
+
+    def test_library_wait_replaces_implicit_wait_of_browser(self):
+        self.lib.set_browser_implicit_wait(2)
+        self.lib.set_selenium_implicit_wait(4)
+        with self.lib._implicit_wait_suspended():
+            pass
+        verify(self.browser, times=2).implicitly_wait(4)
+
+    def test_num_elements_on_page_does_not_wait(self):
+        when(self.lib).get_webelements('link=Next').thenReturn([])
+        self.assertEqual(self.lib.num_elements_on_page('link=Next'), 0)
+        verify(self.browser).implicitly_wait(0)
+        verify(self.browser).implicitly_wait(5)
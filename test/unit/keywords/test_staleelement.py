@@ -0,0 +1,68 @@
+import unittest
+
+from mockito import mock, verify, when
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+from Selenium2LibraryExtension import Selenium2LibraryExtension
+from Selenium2LibraryExtension.utils import scripts
+
+
+class StaleElementTests(unittest.TestCase):
+
+    def setUp(self):
+        self.lib = Selenium2LibraryExtension(stale_element_retries=1)
+        self.browser = mock()
+        self.lib._cache.register(self.browser)
+        self.stale = mock()
+        self.element = mock()
+        when(self.stale).get_attribute('value').thenRaise(
+            StaleElementReferenceException())
+        when(self.element).get_attribute('value').thenReturn('John')
+
+    def test_stale_element_is_found_again(self):
+        when(self.lib)._element_find('id=name', True, True).thenReturn(
+            self.stale, self.element)
+        self.lib.element_value_should_be('id=name', 'John')
+        verify(self.lib, times=2)._element_find('id=name', True, True)
+        verify(self.element, times=1).get_attribute('value')
+        self.assertEqual(self.lib.get_stale_element_stats(),
+                         {'stale': 1, 'recovered': 1, 'exhausted': 0})
+
+    def test_retries_are_bounded(self):
+        when(self.lib)._element_find('id=name', True, True).thenReturn(
+            self.stale)
+        self.assertRaises(StaleElementReferenceException,
+                          self.lib.element_value_should_be, 'id=name', 'John')
+        verify(self.lib, times=2)._element_find('id=name', True, True)
+        self.assertEqual(self.lib.get_stale_element_stats(),
+                         {'stale': 2, 'recovered': 0, 'exhausted': 1})
+
+    def test_given_element_is_used_before_resolving_locator(self):
+        when(self.lib)._element_find('id=name', True, True).thenReturn(
+            self.element)
+        self.assertEqual(self.lib._with_element(
+            'id=name', lambda element: element.get_attribute('value'),
+            self.stale), 'John')
+        verify(self.lib, times=1)._element_find('id=name', True, True)
+
+    def test_targets_resolved_in_browser_are_not_found_from_python(self):
+        when(self.lib)._element_find('id=name', True, True).thenReturn(
+            self.element)
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'clearField',
+            [['id', 'name']]).thenReturn([True, ''])
+        self.lib.clear_input_field('id=name', 3)
+        verify(self.lib, times=0)._element_find('id=name', True, True)
+
+    def test_webelements_are_accepted_as_locators(self):
+        element = WebElement(self.browser, 'element-1')
+        when(self.browser).execute_script(
+            scripts.RUNTIME_CALL, 'elementClasses',
+            [[element], []]).thenReturn([None])
+        self.assertEqual(self.lib._element_classes([element], (), False),
+                         [None])
+
+    def test_negative_retries_are_rejected(self):
+        self.assertRaises(ValueError, Selenium2LibraryExtension,
+                          stale_element_retries=-1)
@@ -0,0 +1,100 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from Selenium2LibraryExtension.utils import CommandTracer
+from Selenium2LibraryExtension.utils.commandtracer import (_Aggregate,
+                                                           percentile)
+
+
+class _Executor(RemoteConnection):
+
+    def __init__(self):
+        pass
+
+    def execute(self, command, params):
+        return {'status': 0, 'value': command}
+
+
+class _Driver(object):
+
+    def __init__(self):
+        self.command_executor = _Executor()
+
+
+class CommandTracerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.tracer = CommandTracer(os.path.join(self.directory, 'trace.json'))
+        self.driver = _Driver()
+        self.tracer.install(self.driver)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_keyword(self, name, *commands):
+        self.tracer.start_keyword(name, {})
+        for command in commands:
+            self.assertEqual(
+                self.driver.command_executor.execute(command, {})['value'],
+                command)
+        self.tracer.end_keyword(name, {})
+
+    def test_commands_are_recorded_by_keyword_and_test(self):
+        self.tracer.start_test('Test', {'longname': 'Suite.Test'})
+        self.run_keyword('Lib.Find', 'findElements', 'findElements')
+        self.run_keyword('Lib.Find', 'findElements')
+        self.run_keyword('Lib.Click', 'clickElement')
+        self.assertEqual(self.tracer.count(), 4)
+        self.tracer.end_test('Test', {})
+
+        summary = self.tracer.summary()
+        self.assertEqual(summary['tests']['Suite.Test']['commands'], 4)
+        self.assertEqual(summary['keywords']['Lib.Find']['calls'], 2)
+        self.assertEqual(summary['keywords']['Lib.Find']['commands_per_call'],
+                         1.5)
+        self.assertEqual(summary['commands']['clickElement']['commands'], 1)
+
+    def test_commands_are_attributed_to_the_innermost_keyword(self):
+        self.tracer.start_keyword('User Keyword', {})
+        self.run_keyword('Lib.Find', 'findElements')
+        self.tracer.end_keyword('User Keyword', {})
+        self.assertEqual(list(self.tracer.summary()['keywords']), ['Lib.Find'])
+
+    def test_summary_is_written_as_json(self):
+        self.run_keyword('Lib.Find', 'findElements')
+        self.tracer.close()
+        with open(os.path.join(self.directory, 'trace.json')) as trace:
+            self.assertEqual(json.load(trace)['total']['commands'], 1)
+
+    def test_tests_are_counted_separately(self):
+        for test in ('First', 'Second'):
+            self.tracer.start_test(test, {'longname': 'Suite.' + test})
+            self.run_keyword('Lib.Find', 'findElements')
+            self.assertEqual(self.tracer.count(), 1)
+            self.tracer.end_test(test, {})
+        self.assertEqual(self.tracer.count(), 0)
+        summary = self.tracer.summary()
+        self.assertEqual(summary['tests']['Suite.Second']['commands'], 1)
+        self.assertEqual(summary['total']['commands'], 2)
+
+    def test_latencies_are_sampled(self):
+        aggregate = _Aggregate()
+        for index in range(3 * _Aggregate.sample_size):
+            aggregate.add('findElements', 0.001, 10)
+        self.assertEqual(len(aggregate.latencies), _Aggregate.sample_size)
+        self.assertEqual(aggregate.summary()['commands'],
+                         3 * _Aggregate.sample_size)
+        self.assertEqual(aggregate.summary()['p50'], 0.001)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([3], 95), 3)
+        self.assertEqual(percentile([], 50), None)
@@ -0,0 +1,107 @@
+import json
+import socket
+import threading
+import time
+import unittest
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from Selenium2LibraryExtension.utils import ConnectionPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+    # closes the connection after the response, without telling the client
+    close_after = False
+    delay = 0
+
+    def do_GET(self):
+        _Handler.connections.add(self.client_address)
+        time.sleep(_Handler.delay)
+        if _Handler.close_after:
+            self.close_connection = True
+        body = json.dumps({'status': 0, 'value': self.path}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Driver(object):
+
+    def __init__(self, executor):
+        self.command_executor = executor
+
+
+class ConnectionPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        _Handler.connections = set()
+        _Handler.close_after = False
+        _Handler.delay = 0
+        self.server = HTTPServer(('127.0.0.1', 0), _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:%s' % self.server.server_port
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def execute(self, executor, times):
+        for _ in range(times):
+            response = executor.execute(Command.GET_TITLE,
+                                        {'sessionId': 'abc'})
+            self.assertEqual(response['value'], '/session/abc/title')
+
+    def test_commands_reuse_one_connection(self):
+        pool = ConnectionPool()
+        executor = RemoteConnection(self.url)
+        pool.install(_Driver(executor))
+        self.execute(executor, 5)
+        stats = pool.stats()
+        self.assertEqual((stats['requests'], stats['opened'], stats['reused']),
+                         (5, 1, 4))
+        self.assertEqual(len(_Handler.connections), 1)
+        pool.close_all()
+
+    def test_connection_closed_by_server_is_retried(self):
+        pool = ConnectionPool()
+        executor = RemoteConnection(self.url)
+        pool.install(_Driver(executor))
+        _Handler.close_after = True
+        self.execute(executor, 1)
+        _Handler.close_after = False
+        self.execute(executor, 1)
+        stats = pool.stats()
+        self.assertEqual((stats['requests'], stats['retried']), (3, 1))
+        pool.close_all()
+
+    def test_timeouts_are_not_retried(self):
+        pool = ConnectionPool(timeout=0.2)
+        executor = RemoteConnection(self.url)
+        pool.install(_Driver(executor))
+        self.execute(executor, 1)
+        _Handler.delay = 0.5
+        self.assertRaises(socket.timeout, self.execute, executor, 1)
+        stats = pool.stats()
+        self.assertEqual((stats['requests'], stats['retried']), (2, 0))
+        pool.close_all()
+
+    def test_disabled_pool_is_not_installed(self):
+        executor = RemoteConnection(self.url)
+        ConnectionPool(size=0).install(_Driver(executor))
+        self.assertIs(type(executor), RemoteConnection)
@@ -0,0 +1,89 @@
+import unittest
+
+from mockito import mock, verify, when
+from selenium.common.exceptions import StaleElementReferenceException
+
+from Selenium2LibraryExtension.utils import ElementCache, scripts
+
+
+class ElementCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = mock()
+        self.element = mock()
+        self.cache = ElementCache(2)
+        self.finds = []
+
+    def find(self, *elements):
+        def find():
+            self.finds.append(None)
+            return list(elements)
+        return find
+
+    def stamp(self, elements, stamp, present=True):
+        when(self.driver).execute_script(
+            scripts.RUNTIME_CALL, 'generation',
+            [elements]).thenReturn([stamp, present])
+
+    def test_element_is_cached_while_document_does_not_change(self):
+        self.stamp([], 'doc:0')
+        self.stamp([self.element], 'doc:0')
+        for _ in range(3):
+            self.assertEqual(self.cache.find(self.driver, 'id=name',
+                                             self.find(self.element)),
+                             [self.element])
+        self.assertEqual(len(self.finds), 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+
+    def test_element_is_found_again_when_document_changes(self):
+        self.stamp([], 'doc:0')
+        self.cache.find(self.driver, 'id=name', self.find(self.element))
+        self.stamp([self.element], 'doc:1')
+        self.cache.find(self.driver, 'id=name', self.find(self.element))
+        self.assertEqual(len(self.finds), 2)
+        # the entry is now stamped with the new generation
+        self.stamp([self.element], 'doc:1')
+        self.cache.find(self.driver, 'id=name', self.find(self.element))
+        self.assertEqual(len(self.finds), 2)
+
+    def test_element_is_found_again_when_removed_from_document(self):
+        self.stamp([], 'doc:0')
+        self.cache.find(self.driver, 'id=name', self.find(self.element))
+        self.stamp([self.element], 'doc:0', False)
+        self.cache.find(self.driver, 'id=name', self.find(self.element))
+        self.assertEqual(len(self.finds), 2)
+
+    def test_stale_element_is_found_again(self):
+        other = mock()
+        self.stamp([], 'doc:0')
+        self.cache.find(self.driver, 'id=name', self.find(self.element))
+        when(self.driver).execute_script(
+            scripts.RUNTIME_CALL, 'generation',
+            [[self.element]]).thenRaise(StaleElementReferenceException())
+        self.assertEqual(self.cache.find(self.driver, 'id=name',
+                                         self.find(other)), [other])
+        self.assertEqual(self.cache.stats()['stale'], 1)
+
+    def test_unobservable_documents_and_missing_elements_are_not_cached(self):
+        self.stamp([], None)
+        self.cache.find(self.driver, 'id=name', self.find(self.element))
+        self.stamp([], 'doc:0')
+        self.cache.find(self.driver, 'id=missing', self.find())
+        self.assertEqual(self.cache.stats()['entries'], 0)
+        verify(self.driver, times=2).execute_script(
+            scripts.RUNTIME_CALL, 'generation', [[]])
+
+    def test_oldest_entries_are_evicted(self):
+        self.stamp([], 'doc:0')
+        for locator in ('id=a', 'id=b', 'id=c'):
+            self.cache.find(self.driver, locator, self.find(self.element))
+        self.assertEqual(self.cache.stats()['entries'], 2)
+
+    def test_only_locators_depending_on_document_are_accepted(self):
+        for locator in ('id=name', 'name', '//div', 'css=div.item',
+                        'last_tag=li'):
+            self.assertTrue(ElementCache.accepts(locator), locator)
+        for locator in ('input=current', 'css=input:checked', 'link=Home',
+                        'dom=document.body', self.element):
+            self.assertFalse(ElementCache.accepts(locator), locator)
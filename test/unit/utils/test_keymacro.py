@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from mockito import mock, verify
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+
+from Selenium2LibraryExtension.utils import KeyMacro
+
+
+class KeyMacroTests(unittest.TestCase):
+
+    def test_chords_release_modifiers_with_null(self):
+        macro = KeyMacro('CTRL+a', 'DELETE', 'SHIFT+TAB')
+        self.assertEqual(macro.value, [Keys.CONTROL, 'a', Keys.NULL,
+                                       Keys.DELETE, Keys.SHIFT, Keys.TAB,
+                                       Keys.NULL])
+
+    def test_text_is_typed(self):
+        self.assertEqual(KeyMacro('text:a+b').value, ['a', '+', 'b'])
+        self.assertEqual(KeyMacro('CONTROL++').value,
+                         [Keys.CONTROL, '+', Keys.NULL])
+
+    def test_raw_chords(self):
+        self.assertEqual(KeyMacro((Keys.ALT, Keys.F4)).value,
+                         [Keys.ALT, Keys.F4, Keys.NULL])
+        self.assertEqual(KeyMacro((Keys.F1, )).value, [Keys.F1])
+
+    def test_w3c_actions(self):
+        actions = KeyMacro('CTRL+z', 'text:a' + Keys.SHIFT + 'b').actions
+        self.assertEqual(
+            [(action['type'], action['value'])
+             for action in actions['actions'][0]['actions']],
+            [('keyDown', Keys.CONTROL), ('keyDown', 'z'), ('keyUp', 'z'),
+             ('keyUp', Keys.CONTROL), ('keyDown', 'a'), ('keyUp', 'a'),
+             ('keyDown', Keys.SHIFT), ('keyDown', 'b'), ('keyUp', 'b'),
+             ('keyUp', Keys.SHIFT)])
+
+    def test_macro_is_played_in_one_request(self):
+        driver = mock()
+        driver.w3c = False
+        macro = KeyMacro('CTRL+a', 'DELETE')
+        macro.play(driver)
+        verify(driver, times=1).execute(Command.SEND_KEYS_TO_ACTIVE_ELEMENT,
+                                        {'value': macro.value})
+
+    def test_invalid_steps(self):
+        self.assertRaises(ValueError, KeyMacro)
+        self.assertRaises(ValueError, KeyMacro, 'CTRL+NOPE')
+        self.assertRaises(ValueError, KeyMacro, 'CTRL++a')
@@ -0,0 +1,58 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from Selenium2LibraryExtension.utils import KeywordProfiler
+
+
+class KeywordProfilerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.profiler = KeywordProfiler(os.path.join(self.directory, 'profile'))
+        self.profiler.start_test('Test', {'longname': 'Suite.Test'})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_self_time_is_split(self):
+        self.profiler.start_keyword('Outer', {})
+        self.profiler.start_keyword('Lib.Wait', {})
+        self.profiler.command_executed('executeScript', 0.2, {}, {})
+        self.profiler.slept(0.1)
+        time.sleep(0.35)
+        self.profiler.end_keyword('Lib.Wait', {})
+        self.profiler.end_keyword('Outer', {})
+
+        report = dict((row['keyword'], row) for row in self.profiler.report())
+        wait = report['Lib.Wait']
+        self.assertEqual(wait['calls'], 1)
+        self.assertEqual((wait['driver'], wait['sleep']), (0.2, 0.1))
+        self.assertAlmostEqual(wait['python'], wait['self'] - 0.3)
+        self.assertTrue(report['Outer']['wall'] >= wait['wall'])
+        self.assertTrue(report['Outer']['self'] < wait['self'])
+
+    def test_reports_are_written(self):
+        self.profiler.start_keyword('Lib.Wait', {})
+        self.profiler.command_executed('executeScript', 0.2, {}, {})
+        self.profiler.end_keyword('Lib.Wait', {})
+        self.profiler.close()
+
+        path = os.path.join(self.directory, 'profile')
+        with open(path + '.folded') as folded:
+            self.assertIn('Suite.Test;Lib.Wait;[driver] 200\n',
+                          folded.readlines())
+        with open(path + '.json') as report:
+            self.assertEqual(json.load(report)[0]['keyword'], 'Lib.Wait')
+        with open(path + '.html') as report:
+            self.assertIn('<td data-value="Lib.Wait">Lib.Wait</td>',
+                          report.read())
+
+    def test_quotes_are_escaped_in_html_attributes(self):
+        self.assertIn('<td data-value="Click &quot;OK&quot;">Click "OK"</td>',
+                      self.profiler._html_row(
+                          dict(keyword='Click "OK"', calls=1, wall=0, self=0,
+                               driver=0, sleep=0, python=0)))
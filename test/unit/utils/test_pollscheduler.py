@@ -0,0 +1,42 @@
+import unittest
+
+from Selenium2LibraryExtension.utils import PollScheduler
+
+
+class PollSchedulerTests(unittest.TestCase):
+
+    def test_fast_polls_use_interval(self):
+        scheduler = PollScheduler(0.05, 1, 2, 0, fast_polls=3)
+        self.assertEqual([scheduler.delay(i, 10) for i in range(3)],
+                         [0.05, 0.05, 0.05])
+
+    def test_backoff_after_fast_polls(self):
+        scheduler = PollScheduler(0.05, 1, 2, 0, fast_polls=1)
+        self.assertEqual([scheduler.delay(i, 10) for i in range(4)],
+                         [0.05, 0.1, 0.2, 0.4])
+
+    def test_delay_is_capped_by_max_interval(self):
+        scheduler = PollScheduler(0.05, 1, 2, 0)
+        self.assertEqual(scheduler.delay(100, 10), 1)
+        self.assertEqual(scheduler.delay(100000, 10), 1)
+
+    def test_delay_never_goes_past_deadline(self):
+        scheduler = PollScheduler(0.05, 1, 2, 0)
+        self.assertEqual(scheduler.delay(10, 0.3), 0.3)
+        self.assertEqual(scheduler.delay(10, -1), 0)
+
+    def test_jitter_stays_in_bounds(self):
+        scheduler = PollScheduler(1, 1, 1, 0.1)
+        for _ in range(100):
+            delay = scheduler.delay(0, 10)
+            self.assertTrue(0.9 <= delay <= 1.1)
+
+    def test_accepts_robot_time_strings(self):
+        scheduler = PollScheduler('10ms', '2s')
+        self.assertEqual(scheduler.interval, 0.01)
+        self.assertEqual(scheduler.max_interval, 2)
+
+    def test_invalid_schedules(self):
+        self.assertRaises(ValueError, PollScheduler, 2, 1)
+        self.assertRaises(ValueError, PollScheduler, 0.1, 1, 0.5)
+        self.assertRaises(ValueError, PollScheduler, 0.1, 1, 2, 1)
@@ -0,0 +1,49 @@
+import unittest
+
+from mockito import mock, verify, when
+
+from Selenium2LibraryExtension.utils import runtime, scripts
+
+
+class RuntimeTests(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = mock()
+
+    def test_installed_runtime_is_called_by_name(self):
+        when(self.driver).execute_script(
+            scripts.RUNTIME_CALL, 'countElements',
+            [['css', 'tr'], 0]).thenReturn(3)
+        self.assertEqual(
+            runtime.call(self.driver, 'countElements', ['css', 'tr'], 0), 3)
+        verify(self.driver, times=1).execute_script(
+            scripts.RUNTIME_CALL, 'countElements', [['css', 'tr'], 0])
+
+    def test_missing_runtime_is_installed_with_the_call(self):
+        when(self.driver).execute_script(
+            scripts.RUNTIME_CALL, 'elementFocus',
+            [['id', 'field']]).thenReturn(scripts.RUNTIME_MISSING)
+        when(self.driver).execute_script(
+            scripts.RUNTIME + scripts.RUNTIME_CALL, 'elementFocus',
+            [['id', 'field']]).thenReturn(True)
+        self.assertTrue(
+            runtime.call(self.driver, 'elementFocus', ['id', 'field']))
+
+    def test_missing_runtime_is_installed_with_the_async_call(self):
+        when(self.driver).execute_async_script(
+            scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button']]).thenReturn(scripts.RUNTIME_MISSING)
+        when(self.driver).execute_async_script(
+            scripts.RUNTIME + scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button']]).thenReturn(None)
+        self.assertIsNone(
+            runtime.call_async(self.driver, 'clickability', ['id', 'button']))
+        verify(self.driver, times=1).execute_async_script(
+            scripts.RUNTIME + scripts.RUNTIME_CALL_ASYNC, 'clickability',
+            [['id', 'button']])
+
+    def test_every_function_is_in_the_runtime(self):
+        for name, script in scripts._FUNCTIONS:
+            self.assertIn('%s: function () {' % name, scripts.RUNTIME)
+        self.assertIn(scripts.RUNTIME_VERSION, scripts.RUNTIME_CALL)
+        self.assertIn(scripts.RUNTIME_VERSION, scripts.RUNTIME_CALL_ASYNC)
@@ -0,0 +1,129 @@
+import unittest
+
+from mockito import mock
+
+from Selenium2LibraryExtension.utils import PooledBrowserCache, SessionPool
+
+
+class FakeBrowser(object):
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.window_handles = ['main']
+        self.switch_to = mock()
+        self.alive = True
+        self.calls = []
+
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise Exception('session is gone')
+        return 'main'
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append(name)
+
+
+class SessionPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        self.launched = []
+
+    def launch(self):
+        browser = FakeBrowser(len(self.launched))
+        self.launched.append(browser)
+        return browser
+
+    def wait_for_launches(self, pool):
+        for launcher in list(pool._launchers):
+            launcher.join()
+
+    def test_sessions_are_quit_without_pool(self):
+        pool = SessionPool()
+        browser = pool.lease('key', self.launch)
+        pool.release(browser)
+        self.assertEqual(browser.calls, ['quit'])
+        self.assertEqual(len(self.launched), 1)
+
+    def test_released_session_is_reset_and_leased_again(self):
+        pool = SessionPool(size=1)
+        browser = pool.lease('key', self.launch)
+        self.wait_for_launches(pool)
+        pool.release(browser)
+        self.assertEqual(browser.calls,
+                         ['execute_script', 'delete_all_cookies', 'get'])
+        self.assertIs(pool.lease('key', self.launch), browser)
+        self.assertEqual(len(self.launched), 1)
+
+    def test_idle_sessions_are_prelaunched(self):
+        pool = SessionPool(size=3)
+        pool.lease('key', self.launch)
+        self.wait_for_launches(pool)
+        self.assertEqual(len(self.launched), 3)
+        pool.close_all()
+        for browser in self.launched[1:]:
+            self.assertEqual(browser.calls, ['quit'])
+
+    def test_sessions_are_recycled(self):
+        pool = SessionPool(size=1, max_uses=1)
+        browser = pool.lease('key', self.launch)
+        self.wait_for_launches(pool)
+        pool.release(browser)
+        self.assertEqual(browser.calls, ['quit'])
+
+    def test_unhealthy_sessions_are_replaced(self):
+        pool = SessionPool(size=2)
+        browser = pool.lease('key', self.launch)
+        pool.release(browser)
+        self.wait_for_launches(pool)
+        for idle in self.launched:
+            idle.alive = False
+        self.assertNotIn(pool.lease('key', self.launch), self.launched[:2])
+        self.assertIn('quit', browser.calls)
+        self.wait_for_launches(pool)
+
+    def test_sessions_of_other_arguments_are_not_leased(self):
+        self.assertNotEqual(SessionPool.key('chrome', {'a': 1}),
+                            SessionPool.key('firefox', {'a': 1}))
+        self.assertEqual(SessionPool.key('chrome', {'a': 1, 'b': 2}),
+                         SessionPool.key('chrome', {'b': 2, 'a': 1}))
+
+    def test_cache_releases_browsers(self):
+        pool = SessionPool(size=1)
+        cache = PooledBrowserCache(pool)
+        browser = pool.lease('key', self.launch)
+        self.wait_for_launches(pool)
+        pool.close_all()
+        cache.register(browser)
+        cache.close_all()
+        self.assertNotIn('quit', browser.calls)
+        self.assertIs(pool.lease('key', self.launch), browser)
+
+    def test_cache_releases_browsers_leased_again(self):
+        pool = SessionPool(size=1)
+        cache = PooledBrowserCache(pool)
+        browser = pool.lease('key', self.launch)
+        self.wait_for_launches(pool)
+        self.assertEqual(cache.register(browser), 1)
+        cache.close()
+        self.assertIs(pool.lease('key', self.launch), browser)
+        self.assertEqual(cache.register(browser), 1)
+        self.assertEqual(cache.get_open_browsers(), [browser])
+        cache.close_all()
+        self.assertEqual(pool._leased, {})
+        pool.close_all()
+        self.assertIn('quit', browser.calls)
+
+    def test_cache_registers_browsers_leased_again_after_closing_all(self):
+        pool = SessionPool(size=1)
+        cache = PooledBrowserCache(pool)
+        browser = pool.lease('key', self.launch)
+        self.wait_for_launches(pool)
+        self.assertEqual(cache.register(browser), 1)
+        cache.close()
+        cache.close_all()
+        self.assertIs(pool.lease('key', self.launch), browser)
+        self.assertEqual(cache.register(browser), 1)
+        self.assertEqual(cache.get_open_browsers(), [browser])
+        cache.close_all()
+        pool.close_all()